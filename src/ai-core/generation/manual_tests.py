@@ -1,3 +1,6 @@
+import ast
+import asyncio
+import io
 import re
 from typing import Dict, List, Any, Optional
 import structlog
@@ -5,6 +8,10 @@ from ..llm.client import CloudEvolutionClient
 
 logger = structlog.get_logger(__name__)
 
+# camelCase / PascalCase word boundaries and runs of separators for _to_snake_case
+_CAMEL_BOUNDARY = re.compile(r'(.)([A-Z][a-z]+)|([a-z0-9])([A-Z])')
+_NON_WORD = re.compile(r'[\W_]+')
+
 
 class ManualTestGenerator:
     """Generator for manual test cases from requirements"""
@@ -120,7 +127,8 @@ class Test{class_name}:
 {test_methods}
 """
 
-        test_methods = []
+        # Write every method into one buffer instead of collecting and re-joining strings
+        test_methods = io.StringIO()
         for i, test_case in enumerate(test_cases):
             method_name = self._to_snake_case(test_case.get("title", f"test_case_{i}"))
             if not method_name.startswith("test_"):
@@ -130,59 +138,67 @@ class Test{class_name}:
             if severity not in ["LOW", "NORMAL", "HIGH", "CRITICAL"]:
                 severity = "NORMAL"
 
-            method_code = f'''    @allure.title("{test_case.get('title', 'Test Case')}")
+            if i:
+                test_methods.write("\n")
+            test_methods.write(f'''    @allure.title("{test_case.get('title', 'Test Case')}")
     @allure.severity(Severity.{severity})
     @allure.manual
     def {method_name}(self):
         """
         {test_case.get('description', '')}
         """
-        {self._generate_test_steps(test_case.get('steps', []), test_case.get('expected_result', ''))}'''
-
-            test_methods.append(method_code)
+''')
+            test_methods.write(self._generate_test_steps(test_case.get('steps', []), test_case.get('expected_result', '')))
 
         return code_template.format(
             feature=metadata.get("feature", "Generated Tests") if metadata else "Generated Tests",
             story=metadata.get("story", "AI Generated") if metadata else "AI Generated",
             owner_decorator=f'@allure.label("owner", "{metadata.get("owner", "QA")}")' if metadata else '@allure.label("owner", "QA")',
             class_name="GeneratedTests",
-            test_methods="\n".join(test_methods)
+            test_methods=test_methods.getvalue()
         )
 
     def _generate_test_steps(self, steps: List[str], expected: str) -> str:
         """Generate test steps with allure.step"""
-        step_code = []
-        for i, step in enumerate(steps, 1):
-            # Clean up step text
-            clean_step = step.strip().replace('"', "'")
-            if not clean_step:
-                clean_step = f"Step {i}"
-
-            step_code.append(f'        with allure.step("Step {i}: {clean_step}"):')
-            step_code.append('            # TODO: Implement test step')
-            step_code.append('            pass')
-
-        step_code.append(f'        with allure.step("Assert: {expected}"):')
-        step_code.append('            # TODO: Add assertions')
-        step_code.append('            pass')
-
+        step_code = [
+            line
+            for i, step in enumerate(steps, 1)
+            for line in (
+                f'        with allure.step("Step {i}: {step.strip().replace(chr(34), chr(39)) or f"Step {i}"}"):',
+                '            # TODO: Implement test step',
+                '            pass',
+            )
+        ]
+        step_code += [
+            f'        with allure.step("Assert: {expected}"):',
+            '            # TODO: Add assertions',
+            '            pass',
+        ]
         return '\n'.join(step_code)
 
     def _to_snake_case(self, text: str) -> str:
         """Convert text to snake_case"""
-        # Remove non-alphanumeric characters and convert to snake_case
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
-        s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-        # Replace spaces and other non-alphanumeric with underscores
-        s3 = re.sub(r'\W+', '_', s2)
-        # Remove multiple underscores and convert to lowercase
-        return re.sub(r'_+', '_', s3).lower('_')
+        # Split camelCase boundaries in one pass
+        s1 = _CAMEL_BOUNDARY.sub(
+            lambda m: f"{m.group(1) or m.group(3)}_{m.group(2) or m.group(4)}",
+            text
+        )
+        # Collapse spaces, punctuation and repeated underscores, then lowercase
+        return _NON_WORD.sub('_', s1).strip('_').lower()
 
     async def _validate_code(self, code: str) -> Dict[str, Any]:
         """Validate the generated Python code"""
+        # Parsing and compiling are CPU-bound; keep them off the event loop so
+        # other generations can keep awaiting the LLM meanwhile
+        return await asyncio.to_thread(self._check_code, code)
+
+    def _check_code(self, code: str) -> Dict[str, Any]:
+        """Syntax and structure checks behind _validate_code"""
+        tree = None
         try:
-            # Syntax check
-            compile(code, '<string>', 'exec')
+            # Syntax check; the parsed tree is reused for the structure scan
+            tree = ast.parse(code)
+            compile(tree, '<string>', 'exec')
             is_valid = True
             errors = []
         except SyntaxError as e:
@@ -194,22 +210,34 @@ class Test{class_name}:
                 "column": e.offset
             }]
 
-        # Basic structure validation
+        # Basic structure validation in a single walk over the tree
+        has_feature = has_story = False
+        test_count = allure_count = 0
+        for node in ast.walk(tree) if tree is not None else ():
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            if not isinstance(node, ast.ClassDef) and node.name.startswith("test_"):
+                test_count += 1
+            for decorator in node.decorator_list:
+                name = self._decorator_name(decorator)
+                if name.startswith("allure."):
+                    allure_count += 1
+                    has_feature = has_feature or name == "allure.feature"
+                    has_story = has_story or name == "allure.story"
+
         warnings = []
-        if "@allure.feature" not in code:
+        if not has_feature:
             warnings.append({
                 "type": "missing_decorator",
                 "message": "Missing @allure.feature decorator"
             })
 
-        if "@allure.story" not in code:
+        if not has_story:
             warnings.append({
                 "type": "missing_decorator",
                 "message": "Missing @allure.story decorator"
             })
 
-        # Count test functions
-        test_count = len(re.findall(r'def test_\w+\(', code))
         if test_count == 0:
             warnings.append({
                 "type": "no_tests",
@@ -223,10 +251,22 @@ class Test{class_name}:
             "metrics": {
                 "test_functions": test_count,
                 "lines_of_code": len(code.splitlines()),
-                "allure_decorators": code.count("@allure.")
+                "allure_decorators": allure_count
             }
         }
 
+    @staticmethod
+    def _decorator_name(decorator: ast.expr) -> str:
+        """Return the dotted name of a decorator, e.g. "allure.feature" """
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        parts = []
+        while isinstance(decorator, ast.Attribute):
+            parts.append(decorator.attr)
+            decorator = decorator.value
+        if isinstance(decorator, ast.Name):
+            parts.append(decorator.id)
+        return ".".join(reversed(parts))
 
 # Import time for timing
 import time
\ No newline at end of file
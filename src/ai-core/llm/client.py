@@ -1,22 +1,129 @@
 import asyncio
-from typing import List, Dict, Any, Optional, AsyncGenerator
+import hashlib
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
+import httpx
+import numpy as np
+import orjson
 import structlog
 from openai import AsyncOpenAI
 
+from .semantic_cache import SemanticCache, canonicalize
+
 logger = structlog.get_logger(__name__)
 
+# Shared by every client so connections to the API are pooled and reused;
+# the application's shutdown hook closes it with close_http_client
+_shared_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=60.0
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP connection pool"""
+    await _shared_http_client.aclose()
+
+
+# Mirrored by hash_embeddings in the backend's app/utils/embeddings.py; keep them identical
+def _hash_embeddings(texts: List[str]) -> np.ndarray:
+    """Deterministic hash placeholder for real embeddings
+    
+    Each text's 64-byte BLAKE2b digest is scaled to [-1, 1] and repeated to
+    384 dims like sentence-transformers. Identical texts get identical
+    vectors, but similar texts are not close, so only exact matches agree.
+    """
+    digests = b"".join(hashlib.blake2b(text.encode("utf-8"), digest_size=64).digest() for text in texts)
+    raw = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 64)
+    return np.repeat((raw.astype(np.float32) - 128.0) / 128.0, 6, axis=1)
+
+
+# Static prompt text, built once; only the slots are filled per call
+_ANALYZE_SYSTEM_PROMPT = """
+        You are an expert Python code analyzer specializing in test automation.
+        Analyze the provided code and return a detailed analysis.
+        """
+
+_ANALYZE_USER_TEMPLATE = """
+        Analyze the following Python test code:
+
+        ```python
+        {code}
+        ```
+
+        Provide analysis for:
+        1. Code quality and structure
+        2. Adherence to testing standards
+        3. Potential issues or improvements
+        4. Best practices compliance
+
+        Return your analysis in JSON format.
+        """
+
+_SCHEMA_PROMPT_TEMPLATE = """
+        CRITICAL: Your response MUST follow this exact JSON schema:
+        ```json
+        {schema}
+        ```
+
+        Your entire response should be valid JSON that conforms to this schema.
+        Do not include any text outside the JSON structure.
+
+        User Request:
+        {prompt}
+
+        Provide your response:
+        """
+
+# Serialized response schemas by id(); each entry keeps its schema so the id
+# stays taken while cached
+_schema_json_cache: Dict[int, Tuple[Dict[str, Any], str]] = {}
+SCHEMA_JSON_CACHE_SIZE = 64
+
+
+def _schema_json(schema: Dict[str, Any]) -> str:
+    """Indented JSON for a schema, serialized once per schema object"""
+    cached = _schema_json_cache.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    schema_json = orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()
+    _schema_json_cache[id(schema)] = (schema, schema_json)
+    if len(_schema_json_cache) > SCHEMA_JSON_CACHE_SIZE:
+        _schema_json_cache.pop(next(iter(_schema_json_cache)))
+    return schema_json
+
 
 class CloudEvolutionClient:
     """Client for Cloud.ru Evolution Foundation Model API"""
 
-    def __init__(self, api_key: str, base_url: str = "https://foundation-models.api.cloud.ru/v1"):
+    # Sampling above this temperature is meant to vary, so it is never cached
+    CACHE_MAX_TEMPERATURE = 0.5
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://foundation-models.api.cloud.ru/v1",
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         self.client = AsyncOpenAI(
             api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
+            http_client=_shared_http_client
         )
         self.model = "Qwen/Qwen3-Coder-480B-A35B-Instruct"
+        self.semantic_cache = semantic_cache
         self.logger = logger.bind(service="CloudEvolutionClient")
 
+    async def close(self) -> None:
+        """Persist the semantic cache, if any, on shutdown"""
+        if self.semantic_cache:
+            self.semantic_cache.save()
+
+    async def __aenter__(self) -> "CloudEvolutionClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
     async def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -28,6 +135,19 @@ class CloudEvolutionClient:
         """
         Send chat completion request to Cloud.ru Evolution API
         """
+        # Only plain, low-temperature requests are served from the semantic cache
+        cacheable = (
+            self.semantic_cache is not None
+            and not stream
+            and not kwargs
+            and temperature <= self.CACHE_MAX_TEMPERATURE
+        )
+        if cacheable:
+            embedding = await self.get_embedding(canonicalize(messages, self.model, temperature))
+            cached = self.semantic_cache.lookup(embedding)
+            if cached is not None:
+                return cached
+
         try:
             params = {
                 "model": self.model,
@@ -53,6 +173,8 @@ class CloudEvolutionClient:
                 response = await self.client.chat.completions.create(**params)
                 content = response.choices[0].message.content
                 self.logger.info("Received chat completion response", tokens=len(content or ""))
+                if cacheable and content:
+                    self.semantic_cache.add(embedding, content)
                 return content or ""
 
         except Exception as e:
@@ -67,25 +189,27 @@ class CloudEvolutionClient:
             if chunk.choices[0].delta.content is not None:
                 yield chunk.choices[0].delta.content
 
-    async def get_embedding(self, text: str) -> List[float]:
+    async def get_embedding(self, text: str) -> np.ndarray:
         """
         Get text embedding for semantic search
         Note: This might require a different model or endpoint
         """
-        # TODO: Implement actual embedding from Cloud.ru or use alternative
-        # For now, we'll use a mock implementation
-        import hashlib
-        hash_object = hashlib.md5(text.encode())
-        hex_dig = hash_object.hexdigest()
+        return _hash_embeddings([text])[0]
 
-        # Convert hash to a simple embedding vector (384 dimensions like sentence-transformers)
-        embedding = []
-        for i in range(0, len(hex_dig), 2):
-            byte_val = int(hex_dig[i:i+2], 16)
-            normalized = (byte_val - 128) / 128.0  # Normalize to [-1, 1]
-            embedding.extend([normalized] * 6)  # Repeat to get 384 dims
+    async def get_embedding_list(self, text: str) -> List[float]:
+        """
+        Get text embedding as plain floats, for consumers that need JSON-friendly output
+        """
+        return (await self.get_embedding(text)).tolist()
 
-        return embedding[:384]
+    def get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Get L2-normalized embeddings for many texts as one (N, 384) array,
+        so similarities for all pairs are a single matrix product
+        """
+        embeddings = _hash_embeddings(texts)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+        return embeddings
 
     async def analyze_code(
         self,
@@ -95,31 +219,10 @@ class CloudEvolutionClient:
         """
         Analyze Python code for various purposes
         """
-        system_prompt = """
-        You are an expert Python code analyzer specializing in test automation.
-        Analyze the provided code and return a detailed analysis.
-        """
-
-        user_prompt = f"""
-        Analyze the following Python test code:
-
-        ```python
-        {code}
-        ```
-
-        Provide analysis for:
-        1. Code quality and structure
-        2. Adherence to testing standards
-        3. Potential issues or improvements
-        4. Best practices compliance
-
-        Return your analysis in JSON format.
-        """
-
         try:
             response = await self.chat_completion([
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "system", "content": _ANALYZE_SYSTEM_PROMPT},
+                {"role": "user", "content": _ANALYZE_USER_TEMPLATE.format(code=code)}
             ], temperature=0.1)
 
             # TODO: Parse JSON response
@@ -149,45 +252,87 @@ class CloudEvolutionClient:
             messages.append({"role": "system", "content": system_prompt})
 
         # Add schema guidance to user prompt
-        schema_guided_prompt = f"""
-        CRITICAL: Your response MUST follow this exact JSON schema:
-        ```json
-        {schema}
-        ```
-
-        Your entire response should be valid JSON that conforms to this schema.
-        Do not include any text outside the JSON structure.
-
-        User Request:
-        {prompt}
-
-        Provide your response:
-        """
+        schema_guided_prompt = _SCHEMA_PROMPT_TEMPLATE.format(
+            schema=_schema_json(schema),
+            prompt=prompt
+        )
 
         messages.append({"role": "user", "content": schema_guided_prompt})
+        temperature = 0.3
 
         try:
-            response = await self.chat_completion(
+            # Streaming bypasses the semantic cache in chat_completion, so check it here
+            embedding = None
+            if self.semantic_cache is not None and temperature <= self.CACHE_MAX_TEMPERATURE:
+                embedding = await self.get_embedding(canonicalize(messages, self.model, temperature))
+                cached = self.semantic_cache.lookup(embedding)
+                if cached is not None:
+                    return self._parse_json_response(cached)
+
+            # Stream the completion and stop reading once the JSON object closes
+            chunks = await self.chat_completion(
                 messages=messages,
-                temperature=0.3
+                temperature=temperature,
+                stream=True
             )
+            response, parsed = await self._read_json_stream(chunks)
+            if parsed is not None:
+                if embedding is not None:
+                    self.semantic_cache.add(embedding, response)
+                return parsed
 
-            # Parse JSON from response
-            import json
-            try:
-                # Extract JSON from response (in case there's extra text)
-                start = response.find('{')
-                end = response.rfind('}') + 1
-                if start != -1 and end != 0:
-                    json_content = response[start:end]
-                    return json.loads(json_content)
-                else:
-                    self.logger.warning("No JSON found in schema-guided response")
-                    return {"error": "No valid JSON found", "raw_response": response}
-            except json.JSONDecodeError as e:
-                self.logger.error("Failed to parse JSON response", error=str(e))
-                return {"error": "Invalid JSON", "raw_response": response}
+            return self._parse_json_response(response)
 
         except Exception as e:
             self.logger.error("Schema-guided generation failed", error=str(e))
-            raise
\ No newline at end of file
+            raise
+
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Parse the JSON object in a response, or describe why there is none"""
+        try:
+            # Usually the whole response is the JSON object
+            parsed = orjson.loads(response)
+            if isinstance(parsed, dict):
+                return parsed
+        except orjson.JSONDecodeError:
+            pass
+
+        try:
+            # Extract JSON from response (in case there's extra text)
+            start = response.find('{')
+            end = response.rfind('}') + 1
+            if start != -1 and end != 0:
+                json_content = response[start:end]
+                return orjson.loads(json_content)
+            else:
+                self.logger.warning("No JSON found in schema-guided response")
+                return {"error": "No valid JSON found", "raw_response": response}
+        except orjson.JSONDecodeError as e:
+            self.logger.error("Failed to parse JSON response", error=str(e))
+            return {"error": "Invalid JSON", "raw_response": response}
+
+    async def _read_json_stream(self, chunks: AsyncGenerator[str, None]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Accumulate streamed text until its outermost JSON object closes and parses.
+        Returns the text read and the parsed object, or None if it never parsed.
+        """
+        parts = []
+        depth = 0
+        started = False
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                # Brace counting ignores strings, so it only says when a parse is worth trying
+                depth += chunk.count('{') - chunk.count('}')
+                started = started or '{' in chunk
+                if started and depth <= 0:
+                    text = "".join(parts)
+                    try:
+                        return text, orjson.loads(text[text.find('{'):text.rfind('}') + 1])
+                    except orjson.JSONDecodeError:
+                        pass
+        finally:
+            # Stop the underlying request instead of draining trailing tokens
+            await chunks.aclose()
+
+        return "".join(parts), None
@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import faiss
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def canonicalize(messages: List[Dict[str, str]], model: str, temperature: float) -> str:
+    """Flatten chat messages into one normalized string for embedding
+    
+    The model and temperature are part of the key, so a response sampled
+    under one setting is never served for another.
+    """
+    lines = [f"model: {model}", f"temperature: {temperature:g}"]
+    lines.extend(
+        f"{message.get('role', '')}: {' '.join(str(message.get('content', '')).split())}"
+        for message in messages
+    )
+    return "\n".join(lines)
+
+
+class SemanticCache:
+    """Cache of chat completions keyed by embedding similarity of the prompt"""
+
+    def __init__(
+        self,
+        input_dim: int = 384,
+        dim: int = 128,
+        threshold: float = 0.92,
+        path: Optional[str] = None,
+        max_entries: int = 10000
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        # Fixed random projection to shrink stored vectors; the seed keeps it
+        # identical across runs so a persisted index stays comparable
+        self._projection = np.random.default_rng(0).standard_normal((input_dim, dim)).astype(np.float32)
+        self.index = faiss.IndexFlatIP(dim)
+        self.responses: List[str] = []
+        self.logger = logger.bind(service="SemanticCache")
+
+        if self.path and self.path.with_suffix(".index").exists():
+            self.load()
+
+    def _vector(self, embedding: np.ndarray) -> np.ndarray:
+        # float32 input is used as-is, without a copy
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1) @ self._projection
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, embedding: np.ndarray) -> Optional[str]:
+        """Return the cached response for the most similar prompt, if close enough"""
+        if not self.responses:
+            return None
+        similarities, ids = self.index.search(self._vector(embedding), 1)
+        if ids[0][0] != -1 and similarities[0][0] >= self.threshold:
+            self.logger.info("Semantic cache hit", similarity=float(similarities[0][0]))
+            return self.responses[ids[0][0]]
+        return None
+
+    def add(self, embedding: np.ndarray, response: str) -> None:
+        self.index.add(self._vector(embedding))
+        self.responses.append(response)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop the oldest entries past max_entries"""
+        excess = len(self.responses) - self.max_entries
+        if excess > 0:
+            # A flat index renumbers the remaining ids, so they stay aligned with responses
+            self.index.remove_ids(np.arange(excess, dtype=np.int64))
+            del self.responses[:excess]
+
+    def save(self) -> None:
+        """Persist the index and responses next to each other under self.path"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(self.path.with_suffix(".index")))
+        self.path.with_suffix(".json").write_text(json.dumps(self.responses))
+        self.logger.info("Semantic cache saved", entries=len(self.responses))
+
+    def load(self) -> None:
+        self.index = faiss.read_index(str(self.path.with_suffix(".index")))
+        self.responses = json.loads(self.path.with_suffix(".json").read_text())
+        self._evict()
+        self.logger.info("Semantic cache loaded", entries=len(self.responses))
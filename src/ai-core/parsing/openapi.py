@@ -1,32 +1,109 @@
+import copy
+import hashlib
 import yaml
-import json
+import orjson
 from typing import Dict, List, Any, Optional
 import structlog
 
+# simdjson parses JSON specs lazily, so only the fields we read become Python objects
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# libyaml's C loader is much faster on large specs; PyYAML may be built without it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = structlog.get_logger(__name__)
 
+# Operation keys of an OpenAPI path item; anything else there (parameters, summary, ...) is skipped
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS", "TRACE"})
+
+# Expected success status per HTTP method; anything else defaults to 200
+_SUCCESS_STATUS = {
+    "GET": 200,
+    "POST": 201,
+    "PUT": 200,
+    "PATCH": 200,
+    "DELETE": 204
+}
+
 
 class OpenAPIParser:
     """Parser for OpenAPI specifications"""
 
+    # Number of parsed specs kept for repeated uploads of the same document
+    CACHE_SIZE = 128
+
     def __init__(self):
         self.logger = logger.bind(parser="OpenAPIParser")
+        # blake2b(format + spec) -> parse result, oldest first. Entries are private
+        # copies; callers always get their own copy and may mutate it freely
+        self._cache: Dict[bytes, Dict[str, Any]] = {}
+        # Reusing one parser keeps its internal buffers across specs
+        self._simd_parser = simdjson.Parser() if simdjson else None
+
+    def _load_json(self, spec: str | bytes) -> Any:
+        """Parse JSON into a lazy simdjson document, or plain objects without simdjson"""
+        if self._simd_parser is None:
+            return orjson.loads(spec)
+        raw = spec.encode() if isinstance(spec, str) else spec
+        try:
+            return self._simd_parser.parse(raw)
+        except RuntimeError:
+            # The previous document is still referenced somewhere; use a fresh parser
+            self._simd_parser = simdjson.Parser()
+            return self._simd_parser.parse(raw)
+
+    @staticmethod
+    def _sniff(spec: str | bytes) -> str:
+        """Guess the spec format: JSON documents start with '{' or '['"""
+        head = spec[:64].lstrip()
+        if isinstance(head, bytes):
+            head = head.decode("utf-8", "ignore")
+        return "json" if head[:1] in ("{", "[") else "yaml"
+
+    def _to_python(self, value: Any) -> Any:
+        """Materialize any simdjson proxies left in an extracted result"""
+        if isinstance(value, dict):
+            return {key: self._to_python(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._to_python(item) for item in value]
+        if simdjson is not None:
+            if isinstance(value, simdjson.Object):
+                return value.as_dict()
+            if isinstance(value, simdjson.Array):
+                return value.as_list()
+        return value
 
     async def parse(self, spec: str, format: str = "yaml") -> Dict[str, Any]:
         """
         Parse OpenAPI specification from string
         """
+        raw = spec.encode() if isinstance(spec, str) else spec
+        key = hashlib.blake2b(raw, digest_size=16, person=format.lower().encode()[:16]).digest()
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            # Re-insert so the most recently used specs are evicted last
+            self._cache[key] = cached
+            return copy.deepcopy(cached)
+
         try:
             if format.lower() == "yaml":
-                data = yaml.safe_load(spec)
+                data = yaml.load(spec, Loader=_YamlLoader)
             elif format.lower() == "json":
-                data = json.loads(spec)
-            else:
-                # Try to auto-detect format
+                data = self._load_json(spec)
+            elif self._sniff(spec) == "json":
+                # Auto-detected JSON; a YAML flow mapping also starts with '{'
                 try:
-                    data = yaml.safe_load(spec)
-                except:
-                    data = json.loads(spec)
+                    data = self._load_json(spec)
+                except ValueError:
+                    data = yaml.load(spec, Loader=_YamlLoader)
+            else:
+                data = yaml.load(spec, Loader=_YamlLoader)
 
             # Normalize to OpenAPI 3.0 format
             normalized = self._normalize_spec(data)
@@ -41,12 +118,18 @@ class OpenAPIParser:
                 title=normalized.get("info", {}).get("title")
             )
 
-            return {
+            # Copy out only the parts of a lazy JSON document that ended up in the result
+            result = self._to_python({
                 "info": normalized.get("info", {}),
                 "servers": normalized.get("servers", []),
                 "endpoints": endpoints,
                 "schemas": self._extract_schemas(normalized)
-            }
+            })
+
+            self._cache[key] = copy.deepcopy(result)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            return result
 
         except Exception as e:
             self.logger.error("Failed to parse OpenAPI spec", error=str(e))
@@ -87,25 +170,29 @@ class OpenAPIParser:
 
         for path, path_item in paths.items():
             for method, operation in path_item.items():
-                if method.upper() in ["GET", "POST", "PUT", "DELETE", "PATCH"]:
-                    endpoint = {
-                        "path": path,
-                        "method": method.upper(),
-                        "operation_id": operation.get("operationId"),
-                        "summary": operation.get("summary", ""),
-                        "description": operation.get("description", ""),
-                        "tags": operation.get("tags", []),
-                        "parameters": self._extract_parameters(operation),
-                        "request_body": self._extract_request_body(operation),
-                        "responses": operation.get("responses", {}),
-                        "security": operation.get("security", [])
-                    }
-
-                    # Extract examples
-                    if "examples" in operation:
-                        endpoint["examples"] = operation["examples"]
-
-                    endpoints.append(endpoint)
+                method = method.upper()
+                if method not in _HTTP_METHODS:
+                    continue
+
+                endpoint = {
+                    "path": path,
+                    "method": method,
+                    "operation_id": operation.get("operationId"),
+                    "summary": operation.get("summary", ""),
+                    "description": operation.get("description", ""),
+                    "tags": operation.get("tags", []),
+                    "parameters": self._extract_parameters(operation),
+                    "request_body": self._extract_request_body(operation),
+                    "responses": operation.get("responses", {}),
+                    "security": operation.get("security", [])
+                }
+
+                # Extract examples
+                examples = operation.get("examples")
+                if examples is not None:
+                    endpoint["examples"] = examples
+
+                endpoints.append(endpoint)
 
         return endpoints
 
@@ -166,39 +253,39 @@ class OpenAPIParser:
 
     def generate_test_scenarios(self, endpoint: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate test scenarios for an endpoint"""
-        scenarios = []
         method = endpoint["method"]
+        path = endpoint["path"]
+        prefix = f"{method} {path}"
         parameters = endpoint.get("parameters", [])
 
         # Happy path scenario
-        scenarios.append({
-            "name": f"{method} {endpoint['path']} - Success",
+        scenarios = [{
+            "name": f"{prefix} - Success",
             "type": "happy_path",
-            "description": f"Successful {method} request to {endpoint['path']}",
+            "description": f"Successful {method} request to {path}",
             "request_data": self._generate_sample_request(endpoint),
             "expected_status": self._get_success_status(method),
             "expected_response": {"status": "success"}
-        })
+        }]
 
         # Negative scenarios
         if method in ["POST", "PUT", "PATCH"]:
             # Invalid request body
             scenarios.append({
-                "name": f"{method} {endpoint['path']} - Invalid data",
+                "name": f"{prefix} - Invalid data",
                 "type": "negative",
-                "description": f"Request with invalid data to {endpoint['path']}",
+                "description": f"Request with invalid data to {path}",
                 "request_data": {"invalid": "data"},
                 "expected_status": 400,
                 "expected_response": {"error": "Bad Request"}
             })
 
         # Missing required parameters
-        required_params = [p for p in parameters if p.get("required", False)]
-        if required_params:
+        if any(p.get("required", False) for p in parameters):
             scenarios.append({
-                "name": f"{method} {endpoint['path']} - Missing required params",
+                "name": f"{prefix} - Missing required params",
                 "type": "negative",
-                "description": f"Request missing required parameters to {endpoint['path']}",
+                "description": f"Request missing required parameters to {path}",
                 "request_data": {},
                 "expected_status": 400,
                 "expected_response": {"error": "Missing required parameters"}
@@ -207,9 +294,9 @@ class OpenAPIParser:
         # Authentication scenarios
         if endpoint.get("security"):
             scenarios.append({
-                "name": f"{method} {endpoint['path']} - Unauthorized",
+                "name": f"{prefix} - Unauthorized",
                 "type": "negative",
-                "description": f"Request without authentication to {endpoint['path']}",
+                "description": f"Request without authentication to {path}",
                 "request_data": {},
                 "expected_status": 401,
                 "expected_response": {"error": "Unauthorized"}
@@ -236,13 +323,11 @@ class OpenAPIParser:
 
         return {"sample": "data"}
 
-    def _get_success_status(self, method: str) -> int:
+    @staticmethod
+    def _get_success_status(method: str) -> int:
         """Get expected success status for HTTP method"""
-        status_map = {
-            "GET": 200,
-            "POST": 201,
-            "PUT": 200,
-            "PATCH": 200,
-            "DELETE": 204
-        }
-        return status_map.get(method, 200)
\ No newline at end of file
+        return _SUCCESS_STATUS.get(method, 200)
+
+
+# Shared instance so the parse cache is reused across requests
+openapi_parser = OpenAPIParser()
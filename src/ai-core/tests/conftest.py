@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# ai-core is not an installed package; import its modules from the source tree
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,89 @@
+import orjson
+import pytest
+
+from parsing.openapi import OpenAPIParser
+
+YAML_SPEC = """
+openapi: 3.0.0
+info:
+  title: Pet Store
+  version: 1.0.0
+paths:
+  /pets:
+    get:
+      summary: List pets
+    post:
+      summary: Create a pet
+components:
+  schemas:
+    Pet:
+      type: object
+"""
+
+JSON_SPEC = orjson.dumps({
+    "openapi": "3.0.0",
+    "info": {"title": "Pet Store", "version": "1.0.0"},
+    "paths": {"/pets": {"get": {"summary": "List pets"}, "parameters": []}},
+}).decode()
+
+# Starts with '{' like JSON, but unquoted keys make it YAML only
+FLOW_YAML_SPEC = "{openapi: 3.0.0, info: {title: Flow Store}, paths: {/pets: {delete: {summary: Remove}}}}"
+
+
+def _spec(title: str) -> str:
+    return orjson.dumps({"openapi": "3.0.0", "info": {"title": title}, "paths": {}}).decode()
+
+
+@pytest.mark.asyncio
+class TestOpenAPIParser:
+    """Test cases for OpenAPIParser"""
+
+    async def test_parse_yaml(self):
+        result = await OpenAPIParser().parse(YAML_SPEC, format="yaml")
+
+        assert result["info"]["title"] == "Pet Store"
+        assert [(e["method"], e["path"]) for e in result["endpoints"]] == [
+            ("GET", "/pets"),
+            ("POST", "/pets"),
+        ]
+        assert result["schemas"] == {"Pet": {"type": "object"}}
+
+    async def test_parse_json(self):
+        result = await OpenAPIParser().parse(JSON_SPEC, format="json")
+
+        assert result["info"]["title"] == "Pet Store"
+        # Non-operation keys of a path item are skipped
+        assert [(e["method"], e["path"]) for e in result["endpoints"]] == [("GET", "/pets")]
+
+    async def test_sniffed_flow_mapping_falls_back_to_yaml(self):
+        result = await OpenAPIParser().parse(FLOW_YAML_SPEC, format="auto")
+
+        assert result["info"]["title"] == "Flow Store"
+        assert [(e["method"], e["path"]) for e in result["endpoints"]] == [("DELETE", "/pets")]
+
+    async def test_cache_hit_ignores_caller_mutation(self):
+        parser = OpenAPIParser()
+        first = await parser.parse(YAML_SPEC)
+        first["info"]["title"] = "Changed"
+        first["endpoints"].clear()
+
+        second = await parser.parse(YAML_SPEC)
+
+        assert len(parser._cache) == 1
+        assert second["info"]["title"] == "Pet Store"
+        assert len(second["endpoints"]) == 2
+        assert second is not first
+
+    async def test_oldest_spec_is_evicted(self):
+        parser = OpenAPIParser()
+        parser.CACHE_SIZE = 2
+        first, second, third = _spec("first"), _spec("second"), _spec("third")
+
+        await parser.parse(first, format="json")
+        await parser.parse(second, format="json")
+        # A hit makes "first" the most recently used, so "second" goes next
+        await parser.parse(first, format="json")
+        await parser.parse(third, format="json")
+
+        titles = [entry["info"]["title"] for entry in parser._cache.values()]
+        assert titles == ["first", "third"]
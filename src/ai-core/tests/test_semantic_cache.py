@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from llm.semantic_cache import SemanticCache, canonicalize
+
+
+def _embedding(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(384).astype(np.float32)
+
+
+class TestSemanticCache:
+    """Test cases for SemanticCache"""
+
+    def test_lookup_empty(self):
+        assert SemanticCache().lookup(_embedding(1)) is None
+
+    def test_add_and_lookup(self):
+        cache = SemanticCache()
+        cache.add(_embedding(1), "first")
+        cache.add(_embedding(2), "second")
+
+        assert cache.lookup(_embedding(1)) == "first"
+        assert cache.lookup(_embedding(2)) == "second"
+        assert cache.lookup(_embedding(3)) is None
+
+    def test_oldest_entries_are_evicted(self):
+        cache = SemanticCache(max_entries=2)
+        for seed, response in enumerate(["first", "second", "third"], start=1):
+            cache.add(_embedding(seed), response)
+
+        assert cache.responses == ["second", "third"]
+        assert cache.index.ntotal == 2
+        assert cache.lookup(_embedding(1)) is None
+        assert cache.lookup(_embedding(3)) == "third"
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "cache" / "responses"
+        cache = SemanticCache(path=str(path))
+        cache.add(_embedding(1), "first")
+        cache.save()
+
+        restored = SemanticCache(path=str(path))
+
+        assert restored.responses == ["first"]
+        assert restored.lookup(_embedding(1)) == "first"
+
+
+def test_canonicalize_keys_on_model_and_temperature():
+    messages = [{"role": "user", "content": "Generate   tests\n for login"}]
+
+    key = canonicalize(messages, "model-a", 0.0)
+
+    assert key == "model: model-a\ntemperature: 0\nuser: Generate tests for login"
+    assert key != canonicalize(messages, "model-a", 0.5)
+    assert key != canonicalize(messages, "model-b", 0.0)
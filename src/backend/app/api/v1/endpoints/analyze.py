@@ -2,6 +2,7 @@ from typing import Any, Dict, List
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
 import ast
+import asyncio
 
 from app.schemas.test import (
     ValidationRequest,
@@ -12,15 +13,18 @@ from app.schemas.test import (
     DuplicateGroup,
     SimilarTestCase
 )
-from app.services.ai_service import AIService
-from app.services.validation_service import ValidationService
-from app.services.duplicate_service import DuplicateService
+from app.services.ai_service import ai_service
+from app.services.validation_service import validation_service
+from app.services.duplicate_service import duplicate_service
 from app.core.deps import get_current_user, get_current_user_optional, RateLimiter
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 rate_limiter = RateLimiter()
 
+# Code longer than this (in characters) is parsed in a worker thread
+PARSE_IN_THREAD_MIN_LENGTH = 4096
+
 
 @router.post("/validate", response_model=ValidationResponse)
 async def validate_code(
@@ -34,11 +38,21 @@ async def validate_code(
     await rate_limiter.check_limit(f"validate:code:{user_id}")
 
     try:
+        # Start AI validation now so it overlaps with the local syntax check
+        ai_validation = asyncio.ensure_future(ai_service.validate_code(
+            code=request.code,
+            standards=request.standards
+        ))
+
         # First, check syntax
         syntax_valid = True
         syntax_errors = []
         try:
-            ast.parse(request.code)
+            # Parsing a large file would stall the event loop; small ones are cheaper inline
+            if len(request.code) > PARSE_IN_THREAD_MIN_LENGTH:
+                await asyncio.to_thread(ast.parse, request.code)
+            else:
+                ast.parse(request.code)
         except SyntaxError as e:
             syntax_valid = False
             syntax_errors.append({
@@ -49,6 +63,8 @@ async def validate_code(
             })
 
         if not syntax_valid:
+            # Syntax errors are definitive; the AI result is not needed
+            ai_validation.cancel()
             return ValidationResponse(
                 is_valid=False,
                 errors=[{
@@ -62,19 +78,17 @@ async def validate_code(
                 metrics={}
             )
 
-        # Use AI service for deeper validation
-        ai_service = AIService()
-        validation_result = await ai_service.validate_code(
-            code=request.code,
-            standards=request.standards
-        )
-
-        # Use validation service for structural checks
-        val_service = ValidationService()
-        structural_result = await val_service.validate_structure(
-            code=request.code,
-            standards=request.standards,
-            strict_mode=request.strict_mode
+        # AI validation waits on the network while the structural checks and
+        # metrics are local CPU work, so run all three concurrently
+        validation_result, structural_result, metrics = await asyncio.gather(
+            ai_validation,
+            asyncio.to_thread(
+                validation_service.check_structure,
+                request.code,
+                request.standards,
+                request.strict_mode
+            ),
+            asyncio.to_thread(validation_service.calculate_metrics, request.code)
         )
 
         # Merge results
@@ -82,9 +96,6 @@ async def validate_code(
         all_warnings = validation_result.get("warnings", []) + structural_result.get("warnings", [])
         all_suggestions = validation_result.get("suggestions", []) + structural_result.get("suggestions", [])
 
-        # Calculate metrics
-        metrics = val_service.calculate_metrics(request.code)
-
         response = ValidationResponse(
             is_valid=len(all_errors) == 0,
             errors=all_errors,
@@ -128,7 +139,6 @@ async def find_duplicates(
     await rate_limiter.check_limit(f"duplicates:search:{user_id}")
 
     try:
-        duplicate_service = DuplicateService()
         logger.info(
             "Searching for duplicate tests",
             user=username,
@@ -150,16 +160,20 @@ async def find_duplicates(
             threshold=request.similarity_threshold
         )
 
-        # Build similarity matrix for detailed analysis
-        similarity_matrix = duplicate_service.build_similarity_matrix(
-            test_cases
-        )
+        # Build similarity matrix for detailed analysis; it is only returned for
+        # small batches, so skip the quadratic work otherwise
+        similarity_matrix = None
+        if len(test_cases) <= 50:
+            similarity_matrix = await asyncio.to_thread(
+                duplicate_service.build_similarity_matrix,
+                test_cases
+            )
 
         response = DuplicateSearchResponse(
             duplicates=duplicates,
             total_tests=len(test_cases),
             duplicates_found=len(duplicates),
-            similarity_matrix=similarity_matrix if len(test_cases) <= 50 else None
+            similarity_matrix=similarity_matrix
         )
 
         logger.info(
@@ -1,27 +1,199 @@
 """API endpoints for code coverage analysis"""
 
-from typing import List, Optional
+import asyncio
+import hashlib
+import tarfile
+import zipfile
+from collections import defaultdict
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+import jinja2
+import numpy as np
+import orjson
 import structlog
 
+from app.core.config import settings
 from app.schemas.test import (
     UploadedFile,
     CoverageAnalysisRequest,
     CoverageAnalysisResponse,
     GenerateTestsForCoverageRequest,
     GenerateTestsForCoverageResponse,
+    GenerateTestsJobResponse,
     ValidationResult
 )
 from app.services.coverage_service import coverage_service, uploader_service
 from app.services.ai_service import ai_service
-from app.services.validation_service import validation_service
+from app.services.validation_service import validate_structure_sync
 
 router = APIRouter()
 logger = structlog.get_logger(__name__)
 
+# Constant payload for /supported-languages, built once at import
+SUPPORTED_LANGUAGES = {
+    "languages": [
+        {
+            "name": "Python",
+            "value": "python",
+            "frameworks": ["pytest", "unittest"]
+        },
+        {
+            "name": "JavaScript",
+            "value": "javascript",
+            "frameworks": ["jest", "mocha"]
+        },
+        {
+            "name": "TypeScript",
+            "value": "typescript",
+            "frameworks": ["jest", "vitest"]
+        },
+        {
+            "name": "Java",
+            "value": "java",
+            "frameworks": ["junit", "testng"]
+        },
+        {
+            "name": "C#",
+            "value": "csharp",
+            "frameworks": ["nunit", "xunit"]
+        }
+    ]
+}
+
+# Serialized once; the payload never changes between requests
+_SUPPORTED_LANGUAGES_BYTES = orjson.dumps(SUPPORTED_LANGUAGES)
+
+# Prompts for coverage test generation, formatted per request / per function
+_SYSTEM_PROMPT_TEMPLATE = """You are an expert test engineer. Generate comprehensive unit tests using {framework} framework.
 
-@router.post("/analyze", response_model=CoverageAnalysisResponse)
+Requirements:
+1. Follow AAA pattern (Arrange-Act-Assert)
+2. Include both positive and negative test cases
+3. Test all branches and edge cases
+4. Use descriptive test names
+5. Include proper assertions
+6. Return ONLY the test code without explanations"""
+
+_USER_PROMPT_TEMPLATE = """Generate unit tests for this function:
+
+Function: {func.name}
+File: {func.file_path}
+Lines: {func.line_start}-{func.line_end}
+Signature: {func.signature}
+Complexity: {func.complexity}
+Priority: {func.priority}
+
+Project Context:
+{project_context}
+"""
+
+# Validation of generated tests is a cheap AST check; it runs in worker threads
+# so the event loop stays free
+_validate_test_code = partial(validate_structure_sync, standards=["pytest"], strict_mode=False)
+
+# Background generation jobs by ID, oldest first; the oldest are dropped past the limit
+GENERATION_JOBS_SIZE = 256
+_generation_jobs: Dict[str, Dict[str, Any]] = {}
+
+# Generated tests keyed by a digest of the prompts and generation settings, oldest first
+GENERATION_CACHE_SIZE = 4096
+_generation_cache: Dict[bytes, str] = {}
+
+
+def _generation_key(messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> bytes:
+    """Digest of everything that determines an LLM generation"""
+    return hashlib.blake2b(
+        b"\0".join([
+            *(message["content"].encode() for message in messages),
+            settings.CLOUD_MODEL.encode(),
+            str(temperature).encode(),
+            str(max_tokens).encode()
+        ]),
+        digest_size=16
+    ).digest()
+
+
+# Report CSS class per coverage band: below 50 is low, below 80 medium, else high
+_BUCKETS = np.array(["low", "medium", "high"])
+_CUTS = np.array([50.0, 80.0])
+
+
+def _coverage_classes(percentages) -> np.ndarray:
+    """Map coverage percentages to their CSS class in one vectorized lookup"""
+    return _BUCKETS[np.searchsorted(_CUTS, np.asarray(percentages, dtype=np.float64), side="right")]
+
+
+def _partition_test_files(files: List[UploadedFile]) -> Tuple[List[UploadedFile], List[UploadedFile]]:
+    """Split files into (source files, test files) in a single pass"""
+    source_files, test_files = [], []
+    append_source, append_test = source_files.append, test_files.append
+    for f in files:
+        (append_test if f.is_test_file else append_source)(f)
+    return source_files, test_files
+
+
+# Compiled once at import; autoescaping keeps file and function names from
+# injecting markup into the report
+_HTML_REPORT_TEMPLATE = jinja2.Environment(autoescape=True).from_string("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Code Coverage Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        .header { background-color: #f0f0f0; padding: 20px; border-radius: 5px; }
+        .coverage-high { color: green; }
+        .coverage-medium { color: orange; }
+        .coverage-low { color: red; }
+        table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+        th { background-color: #f2f2f2; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Code Coverage Report</h1>
+        <p>Overall Coverage: <strong class="coverage-{{ overall_class }}">{{ '%.1f' % result.overall_coverage }}%</strong></p>
+        <p>Source Files: {{ result.total_files }}</p>
+        <p>Test Files: {{ result.test_files }}</p>
+    </div>
+
+    <h2>File Coverage</h2>
+    <table>
+        <tr>
+            <th>File</th>
+            <th>Functions</th>
+            <th>Coverage</th>
+        </tr>
+        {%- for (file_path, metrics), file_class in file_rows %}
+        <tr>
+            <td>{{ file_path }}</td>
+            <td>{{ metrics.functions_covered }}/{{ metrics.functions_total }}</td>
+            <td class="coverage-{{ file_class }}">{{ '%.1f' % metrics.coverage_percentage }}%</td>
+        </tr>
+        {%- endfor %}
+    </table>
+
+    <h2>Uncovered Functions</h2>
+    <ul>
+        {%- for func in result.uncovered_functions[:10] %}
+        <li>
+            <strong>{{ func.name }}</strong>
+            <span class="coverage-{{ func.priority }}">[{{ func.priority }}]</span>
+            <br>
+            <small>{{ func.file_path }}:{{ func.line_start }}</small>
+        </li>
+        {%- endfor %}
+    </ul>
+</body>
+</html>
+""")
+
+
+@router.post("/analyze", response_model=None, responses={200: {"model": CoverageAnalysisResponse}})
 async def analyze_coverage(
     files: List[UploadFile] = File(...),
     language: str = Form(default="python"),
@@ -32,22 +204,17 @@ async def analyze_coverage(
     Analyze code coverage for uploaded files
     """
     try:
-        uploaded_files = []
-        test_files = []
-
-        # Process uploaded files
-        for file in files:
-            content = await file.read()
-            is_test = "test" in file.filename.lower() or "spec" in file.filename.lower()
-
-            uploaded_file = await uploader_service.upload_from_file(
-                content, file.filename, is_test
+        # Process uploaded files concurrently, reading each in chunks
+        processed = await asyncio.gather(*(
+            uploader_service.upload_from_stream(
+                file,
+                file.filename,
+                uploader_service.is_test_filename(file.filename)
             )
+            for file in files
+        ))
 
-            if is_test:
-                test_files.append(uploaded_file)
-            else:
-                uploaded_files.append(uploaded_file)
+        uploaded_files, test_files = _partition_test_files(processed)
 
         # Create analysis request
         request = CoverageAnalysisRequest(
@@ -61,7 +228,43 @@ async def analyze_coverage(
         # Perform coverage analysis
         result = await coverage_service.analyze_coverage(request)
 
-        return result
+        return ORJSONResponse(result.model_dump())
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/analyze/archive", response_model=None, responses={200: {"model": CoverageAnalysisResponse}})
+async def analyze_coverage_archive(
+    archive: UploadFile = File(...),
+    language: str = Form(default="python"),
+    framework: str = Form(default="pytest"),
+    include_suggestions: bool = Form(default=True)
+):
+    """
+    Analyze code coverage for a project uploaded as one zip or tar archive
+    """
+    try:
+        files = await uploader_service.upload_from_archive(archive.file, archive.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {str(e)}")
+
+    try:
+        source_files, test_files = _partition_test_files(files)
+
+        request = CoverageAnalysisRequest(
+            project_files=source_files,
+            test_files=test_files,
+            language=language,
+            framework=framework,
+            include_suggestions=include_suggestions
+        )
+
+        result = await coverage_service.analyze_coverage(request)
+
+        return ORJSONResponse(result.model_dump())
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -84,8 +287,7 @@ async def upload_from_github(
         logger.info("Repository uploaded", file_count=len(files))
 
         # Separate test files
-        source_files = [f for f in files if not f.is_test_file]
-        test_files = [f for f in files if f.is_test_file]
+        source_files, test_files = _partition_test_files(files)
         logger.info("Files separated", source_files=len(source_files), test_files=len(test_files))
 
         # Create analysis request
@@ -102,7 +304,7 @@ async def upload_from_github(
         result = await coverage_service.analyze_coverage(request)
         logger.info("Coverage analysis complete", overall_coverage=result.overall_coverage)
 
-        return result
+        return ORJSONResponse(result.model_dump())
 
     except Exception as e:
         logger.error("Failed to process GitHub repository", 
@@ -127,8 +329,7 @@ async def upload_from_gitlab(
         files = await uploader_service.upload_from_gitlab(repo_url)
 
         # Separate test files
-        source_files = [f for f in files if not f.is_test_file]
-        test_files = [f for f in files if f.is_test_file]
+        source_files, test_files = _partition_test_files(files)
 
         # Create analysis request
         request = CoverageAnalysisRequest(
@@ -142,13 +343,168 @@ async def upload_from_gitlab(
         # Perform coverage analysis
         result = await coverage_service.analyze_coverage(request)
 
-        return result
+        return ORJSONResponse(result.model_dump())
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process GitLab repository: {str(e)}")
 
 
-@router.post("/generate-tests", response_model=GenerateTestsForCoverageResponse)
+async def _generate_tests(
+    request: GenerateTestsForCoverageRequest,
+    job_id: Optional[str] = None
+) -> GenerateTestsForCoverageResponse:
+    """Generate, validate and aggregate tests for the uncovered functions"""
+    # Per-function events are debug-level; only the start and summary are logged at info
+    log = logger.bind(endpoint="generate_tests", job_id=job_id)
+    log.info("Starting test generation", 
+            function_count=len(request.uncovered_functions),
+            language=request.generation_settings.language if request.generation_settings else "python",
+            framework=request.generation_settings.framework if request.generation_settings else "pytest")
+    
+    generated_tests = {}
+    total_improvement = 0
+    all_errors = []
+    all_warnings = []
+    all_suggestions = []
+
+    framework = request.generation_settings.framework if request.generation_settings else 'pytest'
+    max_tokens = request.generation_settings.max_tokens if request.generation_settings else 2000
+    temperature = request.generation_settings.temperature if request.generation_settings else 0.3
+
+    # The system prompt depends only on the framework, so one message serves every function
+    system_message = {"role": "system", "content": _SYSTEM_PROMPT_TEMPLATE.format(framework=framework)}
+
+    def build_messages(i, func):
+        log.debug(f"Generating test {i+1}/{function_count}", 
+                function_name=func.name, 
+                file_path=func.file_path,
+                complexity=func.complexity)
+        return [
+            system_message,
+            {
+                "role": "user",
+                "content": _USER_PROMPT_TEMPLATE.format(func=func, project_context=request.project_context)
+            }
+        ]
+
+    # Functions sharing a signature in the same file get the same prompt, so
+    # generate once per group and reuse the result for every member
+    groups = defaultdict(list)
+    for func in request.uncovered_functions:
+        key = hashlib.blake2b((func.signature + func.file_path).encode(), digest_size=16).digest()
+        groups[key].append(func)
+    function_count = len(groups)
+
+    messages_batch = [build_messages(i, funcs[0]) for i, funcs in enumerate(groups.values())]
+
+    # Only deterministic (temperature 0) generations are reused across runs
+    cacheable = temperature == 0
+    if cacheable:
+        cache_keys = [_generation_key(messages, temperature, max_tokens) for messages in messages_batch]
+        test_codes = [_generation_cache.get(key) for key in cache_keys]
+    else:
+        test_codes = [None] * len(messages_batch)
+
+    # Submit the remaining prompts as one batch; results keep the group order
+    misses = [i for i, test_code in enumerate(test_codes) if test_code is None]
+    if misses:
+        generated = await ai_service.generate_code_batch(
+            [messages_batch[i] for i in misses],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        for i, test_code in zip(misses, generated):
+            test_codes[i] = test_code
+            if cacheable and not isinstance(test_code, Exception):
+                _generation_cache[cache_keys[i]] = test_code
+                if len(_generation_cache) > GENERATION_CACHE_SIZE:
+                    _generation_cache.pop(next(iter(_generation_cache)))
+    log.info("Generation cache lookups", hits=len(test_codes) - len(misses), misses=len(misses))
+
+    # Validate every generated test in parallel; results follow test_codes order
+    validation_results = iter(await asyncio.gather(*(
+        asyncio.to_thread(_validate_test_code, test_code)
+        for test_code in test_codes
+        if not isinstance(test_code, Exception)
+    )))
+
+    # Convert validation results to strings (validate_structure returns dicts)
+    def format_validation_item(item):
+        """Convert validation dict to string"""
+        if isinstance(item, dict):
+            return f"{item.get('type', 'unknown')}: {item.get('message', 'No message')} (line {item.get('line', 'N/A')})"
+        return str(item)
+
+    for funcs, test_code in zip(groups.values(), test_codes):
+        func = funcs[0]
+        if isinstance(test_code, Exception):
+            all_errors.extend(f"{f.name}: test generation failed: {test_code}" for f in funcs)
+            log.error(f"Test generation failed for {func.name}", 
+                    error=str(test_code),
+                    error_type=type(test_code).__name__)
+            continue
+
+        validation_result = next(validation_results)
+
+        # Collect validation results and convert to strings
+        if validation_result.get("errors"):
+            error_strings = [format_validation_item(e) for e in validation_result["errors"]]
+            all_errors.extend(error_strings)
+            log.warning(f"Validation errors for {func.name}", 
+                      errors=error_strings)
+        
+        if validation_result.get("warnings"):
+            warning_strings = [format_validation_item(w) for w in validation_result["warnings"]]
+            all_warnings.extend(warning_strings)
+        
+        if validation_result.get("suggestions"):
+            suggestion_strings = [format_validation_item(s) for s in validation_result["suggestions"]]
+            all_suggestions.extend(suggestion_strings)
+
+        # Store generated test even if there are warnings (but not errors)
+        if not validation_result.get("errors"):
+            for func in funcs:
+                generated_tests[func.name] = test_code
+                # Estimate coverage improvement (simplified)
+                estimated_improvement = 1.0 / (func.complexity + 1)
+                total_improvement += estimated_improvement
+            
+            log.debug(f"Test generated and validated successfully", 
+                    function_name=func.name,
+                    code_length=len(test_code),
+                    warnings_count=len(validation_result.get("warnings", [])))
+        else:
+            log.error(f"Test validation failed for {func.name}", 
+                    errors=validation_result["errors"])
+
+    # Calculate validation result
+    is_valid = len(all_errors) == 0
+    coverage_improvement = min(total_improvement * 100, 100)  # Cap at 100%
+
+    # Determine test files created
+    test_files_created = [f"test_{name}.py" for name in generated_tests.keys()]
+
+    log.info("Test generation complete", 
+            tests_generated=len(generated_tests),
+            coverage_improvement=coverage_improvement,
+            errors_count=len(all_errors),
+            warnings_count=len(all_warnings),
+            suggestions_count=len(all_suggestions))
+
+    return GenerateTestsForCoverageResponse(
+        generated_tests=generated_tests,
+        coverage_improvement=coverage_improvement,
+        validation=ValidationResult(
+            is_valid=is_valid,
+            errors=all_errors,
+            warnings=all_warnings,
+            suggestions=all_suggestions
+        ),
+        test_files_created=test_files_created
+    )
+
+
+@router.post("/generate-tests", response_model=None, responses={200: {"model": GenerateTestsForCoverageResponse}})
 async def generate_tests_for_coverage(
     request: GenerateTestsForCoverageRequest
 ):
@@ -156,135 +512,65 @@ async def generate_tests_for_coverage(
     Generate tests to improve coverage for uncovered functions
     """
     try:
-        logger.info("Starting test generation", 
-                   function_count=len(request.uncovered_functions),
-                   language=request.generation_settings.language if request.generation_settings else "python",
-                   framework=request.generation_settings.framework if request.generation_settings else "pytest")
-        
-        generated_tests = {}
-        total_improvement = 0
-        all_errors = []
-        all_warnings = []
-        all_suggestions = []
-
-        # Generate tests for each uncovered function
-        for i, func in enumerate(request.uncovered_functions):
-            logger.info(f"Generating test {i+1}/{len(request.uncovered_functions)}", 
-                       function_name=func.name, 
-                       file_path=func.file_path,
-                       complexity=func.complexity)
-            # Create prompt for AI
-            system_prompt = f"""You are an expert test engineer. Generate comprehensive unit tests using {request.generation_settings.framework if request.generation_settings else 'pytest'} framework.
+        result = await _generate_tests(request)
+        return ORJSONResponse(result.model_dump())
 
-Requirements:
-1. Follow AAA pattern (Arrange-Act-Assert)
-2. Include both positive and negative test cases
-3. Test all branches and edge cases
-4. Use descriptive test names
-5. Include proper assertions
-6. Return ONLY the test code without explanations"""
+    except Exception as e:
+        logger.error("Failed to generate tests", 
+                    error=str(e), 
+                    error_type=type(e).__name__,
+                    exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to generate tests: {str(e)}")
 
-            user_prompt = f"""Generate unit tests for this function:
 
-Function: {func.name}
-File: {func.file_path}
-Lines: {func.line_start}-{func.line_end}
-Signature: {func.signature}
-Complexity: {func.complexity}
-Priority: {func.priority}
+async def _run_generation(job_id: str, request: GenerateTestsForCoverageRequest):
+    """Background task: run a generation job and record its outcome in the job store"""
+    job = _generation_jobs.get(job_id)
+    if job is None:
+        return
+    job["status"] = "running"
+    try:
+        job["result"] = await _generate_tests(request, job_id)
+        job["status"] = "completed"
+    except Exception as e:
+        logger.error("Generation job failed",
+                    job_id=job_id,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                    exc_info=True)
+        job["error"] = f"Failed to generate tests: {str(e)}"
+        job["status"] = "failed"
 
-Project Context:
-{request.project_context}
-"""
 
-            # Generate test code using generate_code method
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-            
-            test_code = await ai_service.generate_code(
-                messages=messages,
-                max_tokens=request.generation_settings.max_tokens if request.generation_settings else 2000,
-                temperature=request.generation_settings.temperature if request.generation_settings else 0.3
-            )
+@router.post("/generate-tests/jobs", response_model=GenerateTestsJobResponse, status_code=202)
+async def submit_generate_tests_job(
+    request: GenerateTestsForCoverageRequest,
+    background: BackgroundTasks
+):
+    """
+    Start test generation in the background and return a job ID to poll
+    """
+    job_id = uuid4().hex
+    _generation_jobs[job_id] = {"job_id": job_id, "status": "pending"}
+    if len(_generation_jobs) > GENERATION_JOBS_SIZE:
+        _generation_jobs.pop(next(iter(_generation_jobs)))
 
-            # Validate generated test
-            validation_result = await validation_service.validate_structure(
-                code=test_code,
-                standards=["pytest"],
-                strict_mode=False
-            )
-            
-            # Convert validation results to strings (validate_structure returns dicts)
-            def format_validation_item(item):
-                """Convert validation dict to string"""
-                if isinstance(item, dict):
-                    return f"{item.get('type', 'unknown')}: {item.get('message', 'No message')} (line {item.get('line', 'N/A')})"
-                return str(item)
-            
-            # Collect validation results and convert to strings
-            if validation_result.get("errors"):
-                error_strings = [format_validation_item(e) for e in validation_result["errors"]]
-                all_errors.extend(error_strings)
-                logger.warning(f"Validation errors for {func.name}", 
-                             errors=error_strings)
-            
-            if validation_result.get("warnings"):
-                warning_strings = [format_validation_item(w) for w in validation_result["warnings"]]
-                all_warnings.extend(warning_strings)
-            
-            if validation_result.get("suggestions"):
-                suggestion_strings = [format_validation_item(s) for s in validation_result["suggestions"]]
-                all_suggestions.extend(suggestion_strings)
+    background.add_task(_run_generation, job_id, request)
+    logger.info("Queued test generation job",
+               job_id=job_id,
+               function_count=len(request.uncovered_functions))
+    return GenerateTestsJobResponse(job_id=job_id, status="pending")
 
-            # Store generated test even if there are warnings (but not errors)
-            if not validation_result.get("errors"):
-                generated_tests[func.name] = test_code
-                # Estimate coverage improvement (simplified)
-                estimated_improvement = 1.0 / (func.complexity + 1)
-                total_improvement += estimated_improvement
-                
-                logger.info(f"Test generated and validated successfully", 
-                           function_name=func.name,
-                           code_length=len(test_code),
-                           warnings_count=len(validation_result.get("warnings", [])))
-            else:
-                logger.error(f"Test validation failed for {func.name}", 
-                           errors=validation_result["errors"])
-
-        # Calculate validation result
-        is_valid = len(all_errors) == 0
-        coverage_improvement = min(total_improvement * 100, 100)  # Cap at 100%
-
-        # Determine test files created
-        test_files_created = [f"test_{name}.py" for name in generated_tests.keys()]
-
-        logger.info("Test generation complete", 
-                   tests_generated=len(generated_tests),
-                   coverage_improvement=coverage_improvement,
-                   errors_count=len(all_errors),
-                   warnings_count=len(all_warnings),
-                   suggestions_count=len(all_suggestions))
-
-        return GenerateTestsForCoverageResponse(
-            generated_tests=generated_tests,
-            coverage_improvement=coverage_improvement,
-            validation=ValidationResult(
-                is_valid=is_valid,
-                errors=all_errors,
-                warnings=all_warnings,
-                suggestions=all_suggestions
-            ),
-            test_files_created=test_files_created
-        )
 
-    except Exception as e:
-        logger.error("Failed to generate tests", 
-                    error=str(e), 
-                    error_type=type(e).__name__,
-                    exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to generate tests: {str(e)}")
+@router.get("/generate-tests/{job_id}", response_model=GenerateTestsJobResponse)
+async def get_generate_tests_job(job_id: str):
+    """
+    Get the status, and once finished the result, of a test generation job
+    """
+    job = _generation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return GenerateTestsJobResponse(**job)
 
 
 @router.get("/supported-languages")
@@ -292,35 +578,7 @@ async def get_supported_languages():
     """
     Get list of supported programming languages for coverage analysis
     """
-    return {
-        "languages": [
-            {
-                "name": "Python",
-                "value": "python",
-                "frameworks": ["pytest", "unittest"]
-            },
-            {
-                "name": "JavaScript",
-                "value": "javascript",
-                "frameworks": ["jest", "mocha"]
-            },
-            {
-                "name": "TypeScript",
-                "value": "typescript",
-                "frameworks": ["jest", "vitest"]
-            },
-            {
-                "name": "Java",
-                "value": "java",
-                "frameworks": ["junit", "testng"]
-            },
-            {
-                "name": "C#",
-                "value": "csharp",
-                "frameworks": ["nunit", "xunit"]
-            }
-        ]
-    }
+    return Response(content=_SUPPORTED_LANGUAGES_BYTES, media_type="application/json")
 
 
 @router.post("/export")
@@ -336,77 +594,24 @@ async def export_coverage_report(
         result = await coverage_service.analyze_coverage(request)
 
         if format == "json":
-            return result
+            return ORJSONResponse(result.model_dump())
 
         elif format == "html":
             # Generate HTML report
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Code Coverage Report</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 40px; }}
-                    .header {{ background-color: #f0f0f0; padding: 20px; border-radius: 5px; }}
-                    .coverage-high {{ color: green; }}
-                    .coverage-medium {{ color: orange; }}
-                    .coverage-low {{ color: red; }}
-                    table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                    th {{ background-color: #f2f2f2; }}
-                </style>
-            </head>
-            <body>
-                <div class="header">
-                    <h1>Code Coverage Report</h1>
-                    <p>Overall Coverage: <strong class="coverage-{'high' if result.overall_coverage >= 80 else 'medium' if result.overall_coverage >= 50 else 'low'}">{result.overall_coverage:.1f}%</strong></p>
-                    <p>Source Files: {result.total_files}</p>
-                    <p>Test Files: {result.test_files}</p>
-                </div>
-
-                <h2>File Coverage</h2>
-                <table>
-                    <tr>
-                        <th>File</th>
-                        <th>Functions</th>
-                        <th>Coverage</th>
-                    </tr>
-            """
-
-            for file_path, metrics in result.file_coverage.items():
-                coverage_class = 'high' if metrics.coverage_percentage >= 80 else 'medium' if metrics.coverage_percentage >= 50 else 'low'
-                html_content += f"""
-                    <tr>
-                        <td>{file_path}</td>
-                        <td>{metrics.functions_covered}/{metrics.functions_total}</td>
-                        <td class="coverage-{coverage_class}">{metrics.coverage_percentage:.1f}%</td>
-                    </tr>
-                """
-
-            html_content += """
-                </table>
-
-                <h2>Uncovered Functions</h2>
-                <ul>
-            """
-
-            for func in result.uncovered_functions[:10]:
-                html_content += f"""
-                    <li>
-                        <strong>{func.name}</strong>
-                        <span class="coverage-{func.priority}">[{func.priority}]</span>
-                        <br>
-                        <small>{func.file_path}:{func.line_start}</small>
-                    </li>
-                """
-
-            html_content += """
-                </ul>
-            </body>
-            </html>
-            """
-
-            return JSONResponse(
+            # Classify the overall figure and every file in a single call
+            pcts = np.fromiter(
+                (m.coverage_percentage for m in result.file_coverage.values()),
+                dtype=np.float64,
+                count=len(result.file_coverage)
+            )
+            overall_class, *file_classes = _coverage_classes(np.append(result.overall_coverage, pcts))
+            html_content = _HTML_REPORT_TEMPLATE.render(
+                result=result,
+                overall_class=overall_class,
+                file_rows=zip(result.file_coverage.items(), file_classes)
+            )
+
+            return HTMLResponse(
                 content=html_content,
                 headers={"Content-Disposition": "attachment; filename=coverage_report.html"}
             )
@@ -1,8 +1,10 @@
-from typing import Any, Dict, List, Optional
-import json
+import asyncio
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, Optional
+import orjson
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from app.schemas.test import (
@@ -14,18 +16,78 @@ from app.schemas.test import (
     UiTestResponse,
     ValidationResult
 )
-from app.services.ai_service import AIService
-from app.services.code_validator import get_code_validator
+from app.services.ai_service import ai_service
+from app.core.config import settings
 from app.core.deps import RateLimiter, get_current_user, get_current_user_optional
 
 logger = structlog.get_logger(__name__)
+
+# Handlers build their response model and return it as an ORJSONResponse, which
+# skips FastAPI's second validation and jsonable_encoder pass. Routes therefore
+# set response_model=None and document the model through responses= instead.
 router = APIRouter()
 
 # Rate limiting
 rate_limiter = RateLimiter()
 
+# Rate limit key prefix per endpoint; the user id is appended per request
+_LIMIT_MANUAL = "generate:manual:"
+_LIMIT_MANUAL_STREAM = "generate:manual:stream:"
+_LIMIT_API = "generate:api:"
+_LIMIT_UI = "generate:ui:"
+_LIMIT_VALIDATED = "generate:validated:"
+
+# Idle proxies drop SSE connections after a while; send a comment line this often
+SSE_PING_INTERVAL = 15
+_SSE_PING = b": ping\n\n"
+
+# Result frames with more generated code than this (in characters) are
+# encoded in a worker thread so other streams keep flowing meanwhile
+SSE_OFFLOAD_MIN_CHARS = 64 * 1024
+
+
+def _sse_frame(payload: Dict[str, Any]) -> bytes:
+    """Encode one SSE data frame"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _sse_result_frame(payload: Dict[str, Any], size_hint: int) -> bytes:
+    """Encode a result frame, off the event loop when size_hint says it is large"""
+    if size_hint < SSE_OFFLOAD_MIN_CHARS:
+        return _sse_frame(payload)
+    return await asyncio.to_thread(_sse_frame, payload)
+
+
+# Fixed progress frames, encoded once
+_STARTED_FRAME = _sse_frame({'status': 'started', 'message': 'Analyzing requirements...'})
+_GENERATING_FRAME = _sse_frame({'status': 'generating', 'progress': 50})
 
-@router.post("/manual", response_model=ManualTestResponse)
+
+def _manual_generation_args(request: ManualTestRequest) -> Dict[str, Any]:
+    """Dump the request models once into the keyword arguments of generate_manual_tests"""
+    return {
+        "requirements": request.requirements,
+        "metadata": request.metadata.model_dump() if request.metadata else None,
+        "generation_settings": request.generation_settings.model_dump() if request.generation_settings else None,
+        "conversation_history": (
+            [msg.model_dump() for msg in request.conversation_history] if request.conversation_history else None
+        )
+    }
+
+
+async def _keepalive(task: asyncio.Future) -> AsyncIterator[bytes]:
+    """Yield SSE ping comments until task is done; cancel it if the stream closes first"""
+    try:
+        while not task.done():
+            done, _ = await asyncio.wait({task}, timeout=SSE_PING_INTERVAL)
+            if not done:
+                yield _SSE_PING
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@router.post("/manual", response_model=None, responses={200: {"model": ManualTestResponse}})
 async def generate_manual_tests(
     request: ManualTestRequest,
     current_user: Dict = Depends(get_current_user_optional)
@@ -35,23 +97,14 @@ async def generate_manual_tests(
     """
     # Apply rate limiting
     user_id = current_user.get('id', 'anonymous') if current_user else 'anonymous'
-    await rate_limiter.check_limit(f"generate:manual:{user_id}")
+    username = current_user.get("username", "anonymous") if current_user else "anonymous"
+    log = logger.bind(user=username, user_id=user_id)
+    await rate_limiter.check_limit(_LIMIT_MANUAL + str(user_id))
+    generation_args = _manual_generation_args(request)
+    started = perf_counter()
 
     try:
-        ai_service = AIService()
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.info(
-            "Generating manual tests",
-            user=username,
-            requirements_length=len(request.requirements)
-        )
-
-        result = await ai_service.generate_manual_tests(
-            requirements=request.requirements,
-            metadata=request.metadata.model_dump() if request.metadata else None,
-            generation_settings=request.generation_settings.model_dump() if request.generation_settings else None,
-            conversation_history=[msg.model_dump() for msg in request.conversation_history] if request.conversation_history else None
-        )
+        result = await ai_service.generate_manual_tests(**generation_args)
 
         response = ManualTestResponse(
             code=result["code"],
@@ -66,21 +119,21 @@ async def generate_manual_tests(
             metadata=request.metadata
         )
 
-        logger.info(
+        log.info(
             "Manual tests generated successfully",
-            user=username,
+            requirements_length=len(request.requirements),
             test_cases_count=len(result["test_cases"]),
-            generation_time=result["generation_time"]
+            generation_time=result["generation_time"],
+            elapsed=perf_counter() - started
         )
 
-        return response
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.error(
+        log.error(
             "Failed to generate manual tests",
-            user=username,
-            error=str(e)
+            error=str(e),
+            elapsed=perf_counter() - started
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -97,28 +150,31 @@ async def generate_manual_tests_stream(
     Generate manual tests with streaming response
     """
     user_id = current_user.get('id', 'anonymous') if current_user else 'anonymous'
-    await rate_limiter.check_limit(f"generate:manual:stream:{user_id}")
+    await rate_limiter.check_limit(_LIMIT_MANUAL_STREAM + str(user_id))
+    generation_args = _manual_generation_args(request)
 
     async def generate_stream():
+        generation = validation_task = None
         try:
-            ai_service = AIService()
-
             # Send initial status
-            yield f"data: {json.dumps({'status': 'started', 'message': 'Analyzing requirements...'})}\n\n"
+            yield _STARTED_FRAME
+
+            # Generate tests, pinging the client while the model works
+            generation = asyncio.ensure_future(ai_service.generate_manual_tests(**generation_args))
+            async for ping in _keepalive(generation):
+                yield ping
+            result = generation.result()
 
-            # Generate tests
-            result = await ai_service.generate_manual_tests(
-                requirements=request.requirements,
-                metadata=request.metadata.model_dump() if request.metadata else None,
-                generation_settings=request.generation_settings.model_dump() if request.generation_settings else None,
-                conversation_history=[msg.model_dump() for msg in request.conversation_history] if request.conversation_history else None
-            )
+            # Start validating before the progress frame goes out, so the
+            # validation call overlaps with flushing it to the client
+            validation_task = asyncio.ensure_future(ai_service.validate_code(result["code"]))
 
             # Send progress
-            yield f"data: {json.dumps({'status': 'generating', 'progress': 50})}\n\n"
+            yield _GENERATING_FRAME
 
-            # Validate
-            validation = await ai_service.validate_code(result["code"])
+            async for ping in _keepalive(validation_task):
+                yield ping
+            validation = validation_task.result()
 
             # Send completion
             response_data = {
@@ -128,14 +184,20 @@ async def generate_manual_tests_stream(
                 'validation': validation,
                 'generation_time': result["generation_time"]
             }
-            yield f"data: {json.dumps(response_data)}\n\n"
+            yield await _sse_result_frame(response_data, len(result["code"]))
 
         except Exception as e:
             error_data = {
                 'status': 'error',
                 'error': str(e)
             }
-            yield f"data: {json.dumps(error_data)}\n\n"
+            yield _sse_frame(error_data)
+
+        finally:
+            # The client may disconnect while the stream is suspended at a yield
+            for task in (generation, validation_task):
+                if task is not None and not task.done():
+                    task.cancel()
 
     return StreamingResponse(
         generate_stream(),
@@ -143,11 +205,13 @@ async def generate_manual_tests_stream(
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # Stop nginx from buffering the stream
+            "X-Accel-Buffering": "no",
         }
     )
 
 
-@router.post("/auto/api", response_model=ApiTestResponse)
+@router.post("/auto/api", response_model=None, responses={200: {"model": ApiTestResponse}})
 async def generate_api_tests(
     request: ApiTestRequest,
     current_user: Dict = Depends(get_current_user_optional)
@@ -156,17 +220,12 @@ async def generate_api_tests(
     Generate API tests from OpenAPI specification
     """
     user_id = current_user.get('id', 'anonymous') if current_user else 'anonymous'
-    await rate_limiter.check_limit(f"generate:api:{user_id}")
+    username = current_user.get("username", "anonymous") if current_user else "anonymous"
+    log = logger.bind(user=username, user_id=user_id)
+    await rate_limiter.check_limit(_LIMIT_API + str(user_id))
+    started = perf_counter()
 
     try:
-        ai_service = AIService()
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.info(
-            "Generating API tests",
-            user=username,
-            endpoints=request.endpoint_filter
-        )
-
         result = await ai_service.generate_api_tests(
             openapi_spec=request.openapi_spec,
             endpoint_filter=request.endpoint_filter,
@@ -184,21 +243,20 @@ async def generate_api_tests(
             validation=ValidationResult(**validation)
         )
 
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.info(
+        log.info(
             "API tests generated successfully",
-            user=username,
-            endpoints_count=len(result["endpoints_covered"])
+            endpoints=request.endpoint_filter,
+            endpoints_count=len(result["endpoints_covered"]),
+            elapsed=perf_counter() - started
         )
 
-        return response
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.error(
+        log.error(
             "Failed to generate API tests",
-            user=username,
-            error=str(e)
+            error=str(e),
+            elapsed=perf_counter() - started
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -206,7 +264,7 @@ async def generate_api_tests(
         )
 
 
-@router.post("/auto/ui", response_model=UiTestResponse)
+@router.post("/auto/ui", response_model=None, responses={200: {"model": UiTestResponse}})
 async def generate_ui_tests(
     request: UiTestRequest,
     current_user: Dict = Depends(get_current_user_optional)
@@ -215,20 +273,12 @@ async def generate_ui_tests(
     Generate UI/E2E tests from HTML content or URL with setup instructions
     """
     user_id = current_user.get('id', 'anonymous') if current_user else 'anonymous'
-    await rate_limiter.check_limit(f"generate:ui:{user_id}")
+    username = current_user.get("username", "anonymous") if current_user else "anonymous"
+    log = logger.bind(user=username, user_id=user_id)
+    await rate_limiter.check_limit(_LIMIT_UI + str(user_id))
+    started = perf_counter()
 
     try:
-        ai_service = AIService()
-        validator = get_code_validator()
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        
-        logger.info(
-            "Generating UI tests",
-            user=username,
-            input_method=request.input_method,
-            framework=request.framework
-        )
-
         result = await ai_service.generate_ui_tests(
             input_method=request.input_method,
             html_content=request.html_content,
@@ -240,13 +290,15 @@ async def generate_ui_tests(
         # Simple validation (UI tests may not be pytest compatible)
         validation = await ai_service.validate_code(result["code"])
 
-        logger.info(
+        log.info(
             "UI tests generated successfully",
-            user=username,
-            scenarios_count=len(result["test_scenarios"])
+            input_method=request.input_method,
+            framework=request.framework,
+            scenarios_count=len(result["test_scenarios"]),
+            elapsed=perf_counter() - started
         )
 
-        return UiTestResponse(
+        response = UiTestResponse(
             code=result["code"],
             selectors_found=result["selectors_found"],
             test_scenarios=result["test_scenarios"],
@@ -255,13 +307,13 @@ async def generate_ui_tests(
             validation=ValidationResult(**validation),
             generation_time=result["generation_time"]
         )
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.error(
+        log.error(
             "Failed to generate UI tests",
-            user=username,
-            error=str(e)
+            error=str(e),
+            elapsed=perf_counter() - started
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -295,7 +347,7 @@ class GenerateWithValidationResponse(BaseModel):
 
 
 
-@router.post("/manual/validated", response_model=GenerateWithValidationResponse)
+@router.post("/manual/validated", response_model=None, responses={200: {"model": GenerateWithValidationResponse}})
 async def generate_manual_tests_with_validation(
     request: GenerateWithValidationRequest,
     current_user: Dict = Depends(get_current_user_optional)
@@ -304,18 +356,14 @@ async def generate_manual_tests_with_validation(
     Generate manual test cases
     """
     user_id = current_user.get('id', 'anonymous') if current_user else 'anonymous'
-    await rate_limiter.check_limit(f"generate:validated:{user_id}")
+    username = current_user.get("username", "anonymous") if current_user else "anonymous"
+    log = logger.bind(user=username, user_id=user_id)
+    await rate_limiter.check_limit(_LIMIT_VALIDATED + str(user_id))
+    generation_args = _manual_generation_args(request)
+    started = perf_counter()
 
     try:
-        ai_service = AIService()
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-
-        result = await ai_service.generate_manual_tests(
-            requirements=request.requirements,
-            metadata=request.metadata.model_dump() if request.metadata else None,
-            generation_settings=request.generation_settings.model_dump() if request.generation_settings else None,
-            conversation_history=[msg.model_dump() for msg in request.conversation_history] if request.conversation_history else None
-        )
+        result = await ai_service.generate_manual_tests(**generation_args)
 
         response = GenerateWithValidationResponse(
             code=result["code"],
@@ -326,24 +374,24 @@ async def generate_manual_tests_with_validation(
                 suggestions=[]
             ),
             test_cases=result["test_cases"],
-            metadata=request.metadata
+            metadata=generation_args["metadata"] or {}
         )
 
-        logger.info(
+        log.info(
             "Manual tests generated successfully",
-            user=username,
+            requirements_length=len(request.requirements),
             test_cases_count=len(result["test_cases"]),
-            generation_time=result["generation_time"]
+            generation_time=result["generation_time"],
+            elapsed=perf_counter() - started
         )
 
-        return response
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
-        username = current_user.get("username", "anonymous") if current_user else "anonymous"
-        logger.error(
+        log.error(
             "Failed to generate manual tests",
-            user=username,
-            error=str(e)
+            error=str(e),
+            elapsed=perf_counter() - started
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -83,6 +83,7 @@ class Settings(BaseSettings):
     MAX_TOKENS_GENERATION: int = 16000  # Increased for large test suites
     TEMPERATURE_GENERATION: float = 0.3
     TOP_P_GENERATION: float = 0.95
+    AI_CONCURRENCY: int = 5  # Max concurrent LLM calls per batch request
 
     # Vector DB
     CHROMA_PERSIST_DIRECTORY: str = "./chroma_db"
@@ -1,3 +1,4 @@
+import math
 from typing import Generator, Optional
 import structlog
 from fastapi import Depends, HTTPException, status
@@ -38,32 +39,56 @@ async def get_db() -> Generator[AsyncSession, None, None]:
             await session.close()
 
 
+# Token bucket per key, refilled from the elapsed time since the last request.
+# Runs atomically in Redis, so concurrent requests and workers need no lock.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - last) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return allowed
+"""
+
+
 class RateLimiter:
-    """Simple rate limiter using Redis"""
+    """Token bucket rate limiter using Redis"""
 
     def __init__(self):
         import redis.asyncio as redis
         self.redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        self._take_token = self.redis.register_script(_TOKEN_BUCKET_SCRIPT)
 
     async def check_limit(self, key: str, limit: int = None, window: int = 60):
-        """Check if rate limit is exceeded"""
+        """Check if rate limit is exceeded
+        
+        Allows bursts of up to `limit` requests, refilled at limit/window per second.
+        """
         limit = limit or settings.RATE_LIMIT_PER_MINUTE
 
         try:
-            current = await self.redis.incr(key)
-            if current == 1:
-                await self.redis.expire(key, window)
-
-            if current > limit:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded. Please try again later.",
-                    headers={"Retry-After": str(window)},
-                )
+            allowed = await self._take_token(keys=[key], args=[limit, limit / window, window])
         except Exception as e:
             logger.error("Rate limiter error", error=str(e))
             # Fail open - don't block if Redis is down
-            pass
+            return
+
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please try again later.",
+                headers={"Retry-After": str(math.ceil(window / limit))},
+            )
 
 
 # OAuth2 scheme for token handling
@@ -1,19 +1,54 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import structlog
 
 
+LOG_QUEUE_SIZE = 10000
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops and counts records while the queue is full
+    
+    The stock handler reports a full queue as a logging error on every call.
+    """
+
+    def __init__(self, queue: queue.Queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Writes to stdout happen on the listener thread; handlers only enqueue records
+_queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_listener_running = False
+
+
 def setup_logging() -> None:
-    """Configure structured logging"""
+    """Configure structured logging and start writing log records to stdout"""
+    global _log_listener
 
     # Configure standard logging
+    if _log_listener is None:
+        _log_listener = logging.handlers.QueueListener(
+            _queue_handler.queue, logging.StreamHandler(sys.stdout)
+        )
     logging.basicConfig(
         format="%(message)s",
-        stream=sys.stdout,
+        handlers=[_queue_handler],
         level=logging.INFO,
     )
+    start_log_listener()
 
     # Configure structlog
     processors = [
@@ -39,11 +74,34 @@ def setup_logging() -> None:
         processors=processors,
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Filtering wrapper turns calls below INFO into no-ops before any processing
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
         cache_logger_on_first_use=True,
     )
 
 
+def start_log_listener() -> None:
+    """Start writing queued log records in the background"""
+    global _log_listener_running
+    if _log_listener is not None and not _log_listener_running:
+        _log_listener.start()
+        _log_listener_running = True
+
+
+def stop_log_listener() -> None:
+    """Flush queued log records and stop the background writer"""
+    global _log_listener_running
+    if _log_listener is not None and _log_listener_running:
+        _log_listener.stop()
+        _log_listener_running = False
+        if _queue_handler.dropped:
+            sys.stderr.write(f"Dropped {_queue_handler.dropped} log records: log queue was full\n")
+
+
+# Flush whatever is still queued when the process exits
+atexit.register(stop_log_listener)
+
+
 class LoggerMixin:
     """Mixin to add structured logging to classes"""
 
@@ -2,7 +2,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 import structlog
@@ -13,6 +13,7 @@ from app.api.v1.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.core.security import setup_auth
+from app.services.ai_service import close_http_client
 
 
 # Setup logging
@@ -33,6 +34,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down TestOps Copilot API")
+    await close_http_client()
 
 
 # Create FastAPI app
@@ -42,6 +44,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    default_response_class=ORJSONResponse,  # orjson encodes large payloads much faster
     lifespan=lifespan
 )
 
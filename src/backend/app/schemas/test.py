@@ -250,6 +250,14 @@ class GenerateTestsForCoverageResponse(BaseModel):
     test_files_created: List[str]
 
 
+class GenerateTestsJobResponse(BaseModel):
+    """Status of a background test generation job"""
+    job_id: str
+    status: str  # pending, running, completed, failed
+    result: Optional[GenerateTestsForCoverageResponse] = None
+    error: Optional[str] = None
+
+
 class UiTestRequest(BaseModel):
     """Request for UI test generation"""
     input_method: str = Field(..., description="Method: 'html' or 'url'")
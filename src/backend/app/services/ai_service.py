@@ -2,6 +2,8 @@ import json
 import time
 import asyncio
 from typing import Any, Dict, List, Optional, Union
+import httpx
+import orjson
 import structlog
 
 from openai import AsyncOpenAI
@@ -12,6 +14,55 @@ from app.core.logging import LoggerMixin
 
 logger = structlog.get_logger(__name__)
 
+# One connection pool for every AsyncOpenAI client, so TCP/TLS connections to
+# the Cloud.ru API are reused across clients and requests; closed on app shutdown
+_shared_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=120.0
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP connection pool"""
+    await _shared_http_client.aclose()
+
+
+# Static text of the schema-guided prompt, built once; only the slots are filled per call
+_SCHEMA_PROMPT_TEMPLATE = """
+{system_prompt}
+
+CRITICAL: Your response MUST follow this exact JSON schema:
+```json
+{schema}
+```
+
+Your entire response should be valid JSON that conforms to this schema.
+Do not include any text outside the JSON structure.
+
+User Request:
+{user_prompt}
+
+Provide your response:
+"""
+
+SCHEMA_JSON_CACHE_SIZE = 64
+
+# Serialized schemas keyed by id(); the schema is kept alongside so the id
+# cannot be reused by another dict while the entry is cached
+_schema_json_cache: Dict[int, Any] = {}
+
+
+def _schema_json(schema: Dict[str, Any]) -> str:
+    """Serialize a schema as indented JSON, once per schema object"""
+    cached = _schema_json_cache.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    schema_json = orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode()
+    _schema_json_cache[id(schema)] = (schema, schema_json)
+    if len(_schema_json_cache) > SCHEMA_JSON_CACHE_SIZE:
+        _schema_json_cache.pop(next(iter(_schema_json_cache)))
+    return schema_json
+
 
 class SchemaGuidedPrompt:
     """Schema-guided reasoning prompt template for structured output"""
@@ -83,22 +134,11 @@ class SchemaGuidedPrompt:
     @staticmethod
     def build_prompt_with_schema(system_prompt: str, user_prompt: str, schema: Dict[str, Any]) -> str:
         """Build prompt with schema guidance for structured output"""
-        return f"""
-{system_prompt}
-
-CRITICAL: Your response MUST follow this exact JSON schema:
-```json
-{json.dumps(schema, indent=2)}
-```
-
-Your entire response should be valid JSON that conforms to this schema.
-Do not include any text outside the JSON structure.
-
-User Request:
-{user_prompt}
-
-Provide your response:
-"""
+        return _SCHEMA_PROMPT_TEMPLATE.format(
+            system_prompt=system_prompt,
+            schema=_schema_json(schema),
+            user_prompt=user_prompt
+        )
 
 
 class CloudEvolutionClient:
@@ -109,10 +149,11 @@ class CloudEvolutionClient:
             api_key=settings.CLOUD_API_KEY,
             base_url=settings.CLOUD_API_URL,
             timeout=120.0,  # 2 minutes timeout for each request
-            max_retries=2   # Reduce retries from 5 to 2 for faster failure
+            max_retries=2,  # Reduce retries from 5 to 2 for faster failure
+            http_client=_shared_http_client
         )
         self.model = settings.CLOUD_MODEL
-        self.logger = logger.bind(service="CloudEvolutionClient")
+        self.logger = logger.bind(service="CloudEvolutionClient", model=self.model)
 
     async def chat_completion(
         self,
@@ -150,7 +191,6 @@ class CloudEvolutionClient:
                 # Log request details
                 self.logger.info(
                     "Sending request to Cloud API",
-                    model=self.model,
                     messages_count=len(messages),
                     max_tokens=params["max_tokens"],
                     temperature=params["temperature"],
@@ -186,13 +226,22 @@ class CloudEvolutionClient:
 
                 # Parse JSON if schema was provided
                 if response_schema:
+                    try:
+                        # Usually the whole response is the JSON object
+                        parsed_json = orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        parsed_json = None
+                    if isinstance(parsed_json, dict):
+                        self.logger.info("Successfully parsed JSON response", attempt=attempt + 1)
+                        return parsed_json
+
                     try:
                         # Extract JSON from response (in case there's extra text)
                         start = content.find('{')
                         end = content.rfind('}') + 1
                         if start != -1 and end != 0:
                             json_content = content[start:end]
-                            parsed_json = json.loads(json_content)
+                            parsed_json = orjson.loads(json_content)
                             self.logger.info("Successfully parsed JSON response", attempt=attempt + 1)
                             return parsed_json
                         else:
@@ -201,7 +250,7 @@ class CloudEvolutionClient:
                                 self.logger.info("Retrying due to invalid JSON format")
                                 continue
                             return content
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         self.logger.error(
                             "Failed to parse JSON response", 
                             error=str(e), 
@@ -236,7 +285,6 @@ class CloudEvolutionClient:
                 error_details = {
                     "error_type": type(e).__name__,
                     "error_message": str(e),
-                    "model": self.model,
                     "messages_count": len(messages) if messages else 0,
                     "attempt": attempt + 1
                 }
@@ -302,6 +350,42 @@ class AIService(LoggerMixin):
             self.logger.error("Failed to generate code", error=str(e))
             raise
 
+    async def generate_code_batch(
+        self,
+        messages_batch: List[List[Dict[str, str]]],
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> List[Union[str, Exception]]:
+        """
+        Generate code for several independent conversations in one call
+        
+        The Cloud.ru chat completions API takes one conversation per request,
+        so the batch is sent as concurrent requests, at most
+        settings.AI_CONCURRENCY at a time.
+        
+        Args:
+            messages_batch: One message list per conversation
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens to generate per conversation
+            
+        Returns:
+            Generated code or the raised exception, in the order of messages_batch
+        """
+        semaphore = asyncio.Semaphore(settings.AI_CONCURRENCY)
+
+        async def generate(messages: List[Dict[str, str]]) -> str:
+            async with semaphore:
+                return await self.generate_code(
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+
+        return await asyncio.gather(
+            *(generate(messages) for messages in messages_batch),
+            return_exceptions=True
+        )
+
     async def generate_manual_tests(
         self,
         requirements: str,
@@ -960,8 +1044,6 @@ When generating Selenium tests for headless Linux environments:
    - --remote-debugging-port=9222
    - --disable-extensions
    - --disable-plugins
-   - --disable-images (for faster loading)
-   - --single-process (for stability)
 3. Set generous timeouts:
    - page_load_timeout: 60 seconds
    - implicit_wait: 20 seconds
@@ -1160,7 +1242,8 @@ Return ONLY code, no markdown, no explanations."""
                         api_key=settings.CLOUD_API_KEY,
                         base_url=settings.CLOUD_API_URL,
                         timeout=120.0,
-                        max_retries=1
+                        max_retries=1,
+                        http_client=_shared_http_client
                     )
                     
                     response = await temp_client.chat.completions.create(
@@ -1,18 +1,29 @@
 """Service for code coverage analysis"""
 
 import ast
+import asyncio
+import hashlib
 import re
 import os
+import shutil
+import tarfile
 import tempfile
 import zipfile
 import subprocess
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional, Set
 import urllib.request
-from git import Repo
+from git import Git, GitCommandError, Repo
 import chardet
 import structlog
 
+# zstandard is only needed for .tar.zst archive uploads
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from app.core.config import settings
 from app.schemas.test import (
     UploadedFile,
     CoverageMetrics,
@@ -25,6 +36,45 @@ from app.schemas.test import (
 
 logger = structlog.get_logger(__name__)
 
+# Filenames containing "test" or "spec" in any case mark test files; one scan, no lowercased copy
+_TEST_RE = re.compile(r"test|spec", re.IGNORECASE).search
+
+# Source code extensions analyzed from repositories and archives
+SOURCE_EXTENSIONS = {
+    '.py', '.java', '.js', '.ts', '.jsx', '.tsx', '.c', '.cpp', '.h', '.hpp',
+    '.cs', '.go', '.rb', '.php', '.swift', '.kt', '.rs', '.scala', '.r',
+}
+
+# Archive types accepted by CodeUploader.upload_from_archive
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar.zst", ".tzst")
+
+# Read size for streamed uploads
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Files of recently analyzed repositories keyed by (repo_url, head commit), oldest first
+REPO_CACHE_SIZE = 16
+_repo_files_cache: Dict[Tuple[str, str], List[UploadedFile]] = {}
+
+# Analysis results keyed by a digest of the request's files and settings, oldest first
+ANALYSIS_CACHE_SIZE = 256
+_analysis_cache: Dict[str, CoverageAnalysisResponse] = {}
+
+
+def _analysis_key(request: CoverageAnalysisRequest) -> str:
+    """Digest identifying a coverage request regardless of file order"""
+    file_digests = sorted(
+        hashlib.sha256(
+            f"{group}\0{f.path}\0{f.is_test_file}\0{f.content}".encode("utf-8", "surrogatepass")
+        ).hexdigest()
+        for group, files in (("project", request.project_files), ("test", request.test_files or []))
+        for f in files
+    )
+    key = hashlib.sha256()
+    for digest in file_digests:
+        key.update(digest.encode())
+    key.update(f"{request.language}\0{request.framework}\0{request.include_suggestions}".encode())
+    return key.hexdigest()
+
 
 class CoverageAnalyzer:
     """Analyzes code coverage for different programming languages"""
@@ -40,6 +90,13 @@ class CoverageAnalyzer:
 
     async def analyze_coverage(self, request: CoverageAnalysisRequest) -> CoverageAnalysisResponse:
         """Analyze code coverage for uploaded files"""
+        # Identical uploads (same files and settings) reuse the previous result
+        cache_key = _analysis_key(request)
+        cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached coverage analysis", files=len(request.project_files))
+            return cached
+
         # Separate source files from test files
         source_files = [f for f in request.project_files if not f.is_test_file]
         test_files = request.test_files or [f for f in request.project_files if f.is_test_file]
@@ -66,7 +123,7 @@ class CoverageAnalyzer:
             source_files, test_files, overall_coverage, uncovered_functions
         )
 
-        return CoverageAnalysisResponse(
+        result = CoverageAnalysisResponse(
             total_files=len(source_files),
             test_files=len(test_files),
             overall_coverage=overall_coverage * 100,
@@ -76,6 +133,11 @@ class CoverageAnalyzer:
             suggestions=suggestions
         )
 
+        _analysis_cache[cache_key] = result
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.pop(next(iter(_analysis_cache)))
+        return result
+
     def _extract_functions(self, file: UploadedFile, language: str) -> List[UncoveredFunction]:
         """Extract functions from source code based on language"""
         if language == 'python':
@@ -356,6 +418,11 @@ class CoverageAnalyzer:
 class CodeUploader:
     """Handles code upload from various sources"""
 
+    @staticmethod
+    def is_test_filename(filename: str) -> bool:
+        """Whether a file name marks a test file ("test" or "spec", case-insensitive)"""
+        return _TEST_RE(filename) is not None
+
     @staticmethod
     @staticmethod
     async def upload_from_file(file_content: bytes | str, filename: str, is_test: bool = False) -> UploadedFile:
@@ -396,6 +463,116 @@ class CodeUploader:
             is_test_file=is_test
         )
 
+    @staticmethod
+    async def upload_from_stream(file, filename: str, is_test: bool = False) -> UploadedFile:
+        """Create UploadedFile from an async file-like object such as UploadFile
+        
+        Reads in fixed-size chunks and stops as soon as the upload exceeds
+        settings.MAX_FILE_SIZE, so oversized files are never fully buffered.
+        """
+        chunks = []
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.MAX_FILE_SIZE:
+                raise ValueError(
+                    f"File {filename} exceeds the maximum size of {settings.MAX_FILE_SIZE} bytes"
+                )
+            chunks.append(chunk)
+
+        return await CodeUploader.upload_from_file(b"".join(chunks), filename, is_test)
+
+    @staticmethod
+    def _is_archived_source(path: str, size: int) -> bool:
+        """Whether an archive member is a source file worth analyzing"""
+        if os.path.splitext(path)[1].lower() not in SOURCE_EXTENSIONS:
+            return False
+        if any(part.startswith('.') for part in path.split('/')):
+            return False
+        if size > settings.MAX_FILE_SIZE:
+            logger.warning("Skipping oversized archive member", file_path=path, size=size)
+            return False
+        return True
+
+    @staticmethod
+    def _read_archive(fileobj, filename: str) -> List[Tuple[str, bytes]]:
+        """Read (path, content) of every source file in a zip or tar archive
+        
+        Tar archives, compressed or not, are read as a stream member by member
+        without extracting anything to disk.
+        """
+        name = filename.lower()
+        members = []
+
+        if name.endswith(".zip"):
+            with zipfile.ZipFile(fileobj) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and CodeUploader._is_archived_source(info.filename, info.file_size):
+                        members.append((info.filename, archive.read(info)))
+            return members
+
+        if name.endswith((".tar.zst", ".tzst")):
+            if zstandard is None:
+                raise ValueError("zstandard is not installed, .tar.zst archives are not supported")
+            fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj)
+
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and CodeUploader._is_archived_source(member.name, member.size):
+                    members.append((member.name, archive.extractfile(member).read()))
+        return members
+
+    @staticmethod
+    async def upload_from_archive(file, filename: str) -> List[UploadedFile]:
+        """Create UploadedFiles from a single archive upload
+        
+        file is a synchronous binary file object, e.g. UploadFile.file.
+        """
+        if not filename.lower().endswith(ARCHIVE_SUFFIXES):
+            raise ValueError(f"Unsupported archive type: {filename}")
+
+        members = await asyncio.to_thread(CodeUploader._read_archive, file, filename)
+        files = [
+            await CodeUploader.upload_from_file(
+                content, path, CodeUploader.is_test_filename(os.path.basename(path))
+            )
+            for path, content in members
+        ]
+        logger.info("Archive processed successfully", archive=filename, total_files=len(files))
+        return files
+
+    @staticmethod
+    def _remote_head(repo_url: str) -> Optional[str]:
+        """Commit SHA of the remote HEAD, or None if it cannot be resolved"""
+        try:
+            output = Git().ls_remote(repo_url, "HEAD")
+        except GitCommandError as e:
+            logger.warning("Failed to resolve remote HEAD", repo_url=repo_url, error=str(e))
+            return None
+        return output.split()[0] if output else None
+
+    @staticmethod
+    def _partial_clone(repo_url: str, target_dir: str, patterns: List[str]) -> None:
+        """Check out only files matching patterns at HEAD, without history or other blobs
+        
+        A blobless, shallow, single-branch clone with no checkout fetches just
+        commits and trees; the sparse checkout then downloads only the blobs
+        of matching files. Falls back to a plain shallow clone when the server
+        or local git does not support partial clone or sparse checkout.
+        """
+        try:
+            repo = Repo.clone_from(
+                repo_url, target_dir,
+                depth=1, filter="blob:none", no_tags=True, single_branch=True, no_checkout=True
+            )
+            repo.git.sparse_checkout("set", "--no-cone", *patterns)
+            repo.git.checkout()
+        except GitCommandError as e:
+            logger.warning("Partial clone failed, falling back to shallow clone", error=str(e))
+            shutil.rmtree(target_dir, ignore_errors=True)
+            os.makedirs(target_dir, exist_ok=True)
+            Repo.clone_from(repo_url, target_dir, depth=1)
+
     @staticmethod
     async def upload_from_github(repo_url: str) -> List[UploadedFile]:
         """Clone and upload from GitHub repository"""
@@ -413,17 +590,21 @@ class CodeUploader:
             '.woff', '.woff2', '.ttf', '.eot',  # Fonts
         }
         
-        # Source code extensions to prioritize
-        SOURCE_EXTENSIONS = {
-            '.py', '.java', '.js', '.ts', '.jsx', '.tsx', '.c', '.cpp', '.h', '.hpp',
-            '.cs', '.go', '.rb', '.php', '.swift', '.kt', '.rs', '.scala', '.r',
-        }
-        
         try:
+            # Repeat analyses of an unchanged repository reuse the files from last time.
+            # git calls wait on the network, so they run in worker threads
+            head_sha = await asyncio.to_thread(CodeUploader._remote_head, repo_url)
+            cache_key = (repo_url, head_sha)
+            if head_sha and cache_key in _repo_files_cache:
+                logger.info("Using cached repository files", repo_url=repo_url, commit=head_sha)
+                return list(_repo_files_cache[cache_key])
+
             with tempfile.TemporaryDirectory() as temp_dir:
                 logger.info("Cloning repository", temp_dir=temp_dir)
-                # Clone the repository with depth 1 for faster cloning
-                Repo.clone_from(repo_url, temp_dir, depth=1)
+                await asyncio.to_thread(
+                    CodeUploader._partial_clone,
+                    repo_url, temp_dir, [f"*{ext}" for ext in sorted(SOURCE_EXTENSIONS)]
+                )
                 logger.info("Repository cloned successfully")
 
                 files = []
@@ -461,7 +642,7 @@ class CodeUploader:
                             with open(file_path, 'rb') as f:
                                 content = f.read()
 
-                            is_test = 'test' in file_name.lower() or 'spec' in file_name.lower()
+                            is_test = CodeUploader.is_test_filename(file_name)
                             uploaded = await CodeUploader.upload_from_file(content, rel_path, is_test)
                             files.append(uploaded)
                             processed_count += 1
@@ -474,7 +655,12 @@ class CodeUploader:
                            processed_files=processed_count, 
                            skipped_files=skipped_count,
                            total_files=len(files))
-                return files
+
+                if head_sha:
+                    _repo_files_cache[cache_key] = files
+                    if len(_repo_files_cache) > REPO_CACHE_SIZE:
+                        _repo_files_cache.pop(next(iter(_repo_files_cache)))
+                return list(files)
         except Exception as e:
             logger.error("Failed to clone GitHub repository", repo_url=repo_url, error=str(e), error_type=type(e).__name__)
             raise Exception(f"Failed to analyze GitHub repository: {str(e)}")
@@ -10,6 +10,7 @@ from app.schemas.test import (
     SimilarTestCase
 )
 from app.core.logging import LoggerMixin
+from app.utils.embeddings import hash_embeddings
 
 logger = structlog.get_logger(__name__)
 
@@ -127,16 +128,14 @@ class DuplicateService(LoggerMixin):
         Generate embeddings for texts (async)
         """
         # TODO: Implement async embedding generation
-        # For now, return dummy embeddings
-        return np.random.rand(len(texts), 384)
+        return self._generate_embeddings_sync(texts)
 
     def _generate_embeddings_sync(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for texts (sync)
         """
         # TODO: Implement actual embedding generation
-        # For now, return dummy embeddings
-        return np.random.rand(len(texts), 384)
+        return hash_embeddings(texts)
 
     def _compute_similarity_matrix(self, embeddings: np.ndarray) -> np.ndarray:
         """
@@ -169,11 +168,9 @@ class DuplicateService(LoggerMixin):
             if visited[i]:
                 continue
 
-            # Find all similar tests
-            similar_indices = [i]
-            for j in range(i + 1, n):
-                if similarity_matrix[i][j] >= threshold:
-                    similar_indices.append(j)
+            # Find all similar tests with one vectorized comparison over the row
+            matches = np.flatnonzero(similarity_matrix[i, i + 1:] >= threshold) + i + 1
+            similar_indices = [i, *matches.tolist()]
 
             if len(similar_indices) > 1:
                 # Mark all as visited
@@ -197,30 +194,26 @@ class DuplicateService(LoggerMixin):
         """
         Create a duplicate group from indices
         """
-        similar_tests = []
-        max_similarity = 0.0
-
-        for i, idx in enumerate(indices):
-            test_case = test_cases[idx]
-
-            # Find max similarity for this test
-            test_similarities = []
-            for j, other_idx in enumerate(indices):
-                if i != j:
-                    sim = similarity_matrix[idx][other_idx]
-                    test_similarities.append(sim)
-                    max_similarity = max(max_similarity, sim)
-
-            similar_tests.append(SimilarTestCase(
-                id=test_case.id or idx,
-                title=test_case.title,
-                similarity_score=float(np.mean(test_similarities)) if test_similarities else 1.0
-            ))
+        # Similarities within the group; the diagonal is zero, so row sums
+        # over len - 1 are the mean similarity to the other members
+        group_matrix = similarity_matrix[np.ix_(indices, indices)]
+        others = len(indices) - 1
+        mean_scores = group_matrix.sum(axis=1) / others if others else np.ones(len(indices))
+        max_similarity = max(0.0, float(group_matrix.max()))
+
+        similar_tests = [
+            SimilarTestCase(
+                id=test_cases[idx].id or idx,
+                title=test_cases[idx].title,
+                similarity_score=float(score)
+            )
+            for idx, score in zip(indices, mean_scores)
+        ]
 
         return DuplicateGroup(
             group_id=f"group_{len(similar_tests)}",
             test_cases=similar_tests,
-            similarity_score=float(max_similarity)
+            similarity_score=max_similarity
         )
 
 
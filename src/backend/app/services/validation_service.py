@@ -27,6 +27,17 @@ class ValidationService(LoggerMixin):
         """
         Validate code structure against standards
         """
+        return self.check_structure(code, standards, strict_mode)
+
+    def check_structure(
+        self,
+        code: str,
+        standards: List[str] = None,
+        strict_mode: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Synchronous structure validation, for callers that offload it with asyncio.to_thread
+        """
         standards = standards or ["allure"]
         errors = []
         warnings = []
@@ -238,4 +249,13 @@ class ValidationService(LoggerMixin):
 
 
 # Create singleton instance
-validation_service = ValidationService()
\ No newline at end of file
+validation_service = ValidationService()
+
+
+def validate_structure_sync(
+    code: str,
+    standards: List[str] = None,
+    strict_mode: bool = False
+) -> Dict[str, Any]:
+    """Validate structure with the shared service; run it via asyncio.to_thread from async code"""
+    return validation_service.check_structure(code, standards, strict_mode)
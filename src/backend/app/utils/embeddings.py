@@ -0,0 +1,17 @@
+"""Deterministic placeholder text embeddings"""
+
+import hashlib
+from typing import List
+
+import numpy as np
+
+
+# The backend image ships only src/backend, so ai-core's llm/client.py keeps
+# the same function; change both together so embeddings stay comparable
+def hash_embeddings(texts: List[str]) -> np.ndarray:
+    """Mock embeddings: each text's 64-byte BLAKE2b digest scaled to [-1, 1]
+    and repeated to 384 dims like sentence-transformers, as one (N, 384)
+    float32 array; identical texts get identical vectors"""
+    digests = b"".join(hashlib.blake2b(text.encode("utf-8"), digest_size=64).digest() for text in texts)
+    raw = np.frombuffer(digests, dtype=np.uint8).reshape(len(texts), 64)
+    return np.repeat((raw.astype(np.float32) - 128.0) / 128.0, 6, axis=1)
@@ -0,0 +1,57 @@
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from unittest.mock import AsyncMock, patch
+
+from app.api.v1.endpoints import coverage
+from app.schemas.test import (
+    GenerateTestsForCoverageRequest,
+    GenerateTestsForCoverageResponse,
+    ValidationResult
+)
+
+
+def _request():
+    return GenerateTestsForCoverageRequest(uncovered_functions=[], project_context="")
+
+
+def _response():
+    return GenerateTestsForCoverageResponse(
+        generated_tests={"add": "def test_add(): pass"},
+        coverage_improvement=50.0,
+        validation=ValidationResult(is_valid=True),
+        test_files_created=["test_add.py"]
+    )
+
+
+@pytest.mark.asyncio
+class TestGenerateTestsJobs:
+    """Test background test generation jobs"""
+
+    async def test_job_completes(self):
+        background = BackgroundTasks()
+        submitted = await coverage.submit_generate_tests_job(_request(), background)
+        assert submitted.status == "pending"
+
+        with patch.object(coverage, "_generate_tests", AsyncMock(return_value=_response())):
+            await background()
+
+        job = await coverage.get_generate_tests_job(submitted.job_id)
+        assert job.status == "completed"
+        assert job.result.generated_tests == {"add": "def test_add(): pass"}
+
+    async def test_job_failure_is_recorded(self):
+        background = BackgroundTasks()
+        submitted = await coverage.submit_generate_tests_job(_request(), background)
+
+        with patch.object(coverage, "_generate_tests", AsyncMock(side_effect=RuntimeError("boom"))):
+            await background()
+
+        job = await coverage.get_generate_tests_job(submitted.job_id)
+        assert job.status == "failed"
+        assert "boom" in job.error
+        assert job.result is None
+
+    async def test_unknown_job(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await coverage.get_generate_tests_job("missing")
+        assert exc_info.value.status_code == 404
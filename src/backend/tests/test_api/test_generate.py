@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
@@ -20,9 +21,8 @@ class TestGenerateAPI:
             }
         }
 
-        with patch('app.api.v1.endpoints.generate.AIService') as mock_service:
+        with patch('app.api.v1.endpoints.generate.ai_service', new_callable=AsyncMock) as mock_instance:
             # Mock the AI service response
-            mock_instance = AsyncMock()
             mock_instance.generate_manual_tests.return_value = {
                 "code": """
 @allure.feature("Authentication")
@@ -59,7 +59,6 @@ class TestGeneratedTests:
                 "warnings": [],
                 "suggestions": []
             }
-            mock_service.return_value = mock_instance
 
             response = await client.post(
                 "/api/v1/generate/manual",
@@ -104,8 +103,7 @@ class TestGeneratedTests:
             "test_types": ["happy_path", "negative"]
         }
 
-        with patch('app.api.v1.endpoints.generate.AIService') as mock_service:
-            mock_instance = AsyncMock()
+        with patch('app.api.v1.endpoints.generate.ai_service', new_callable=AsyncMock) as mock_instance:
             mock_instance.generate_api_tests.return_value = {
                 "code": """
 import pytest
@@ -129,7 +127,6 @@ class TestUserAPI:
                 "warnings": [],
                 "suggestions": []
             }
-            mock_service.return_value = mock_instance
 
             response = await client.post(
                 "/api/v1/generate/auto/api",
@@ -154,10 +151,8 @@ class TestUserAPI:
             "test_types": ["happy_path"]
         }
 
-        with patch('app.api.v1.endpoints.generate.AIService') as mock_service:
-            mock_instance = AsyncMock()
+        with patch('app.api.v1.endpoints.generate.ai_service', new_callable=AsyncMock) as mock_instance:
             mock_instance.generate_api_tests.side_effect = ValueError("Invalid OpenAPI spec")
-            mock_service.return_value = mock_instance
 
             response = await client.post(
                 "/api/v1/generate/auto/api",
@@ -184,4 +179,41 @@ class TestUserAPI:
 
         # At least one should be rate limited
         rate_limited = any(r.status_code == 429 for r in responses)
-        assert rate_limited, "Rate limiting should be enforced"
\ No newline at end of file
+        assert rate_limited, "Rate limiting should be enforced"
+
+@pytest.mark.asyncio
+async def test_manual_stream_closed_early_cancels_validation():
+    """Test closing the SSE stream mid-validation cancels the pending task"""
+    from app.api.v1.endpoints import generate
+
+    cancelled = asyncio.Event()
+
+    async def slow_validate(code):
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with patch.object(generate, "ai_service") as mock_instance:
+        mock_instance.generate_manual_tests = AsyncMock(return_value={
+            "code": "def test_login(): pass",
+            "test_cases": [],
+            "generation_time": 1.0
+        })
+        mock_instance.validate_code = slow_validate
+
+        response = await generate.generate_manual_tests_stream(
+            ManualTestRequest(requirements="User should be able to log in"), None
+        )
+        stream = response.body_iterator
+        assert b"started" in await stream.__anext__()
+        assert b"generating" in await stream.__anext__()
+        # Let the validation task start running
+        await asyncio.sleep(0)
+
+        # The client goes away while the stream is suspended at the progress frame
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    assert cancelled.is_set()
@@ -1,5 +1,8 @@
 """Tests for the coverage service"""
 
+import io
+import tarfile
+
 import pytest
 from unittest.mock import Mock, AsyncMock
 from app.services.coverage_service import CoverageAnalyzer, CodeUploader
@@ -128,6 +131,35 @@ class TestCodeUploader:
             uploaded = await CodeUploader.upload_from_file(content, filename)
             assert uploaded.language == expected_lang
 
+    def test_is_test_filename(self):
+        """Test detection of test files by name"""
+        assert CodeUploader.is_test_filename("test_calculator.py")
+        assert CodeUploader.is_test_filename("Calculator.Spec.ts")
+        assert CodeUploader.is_test_filename("CalculatorTest.java")
+        assert not CodeUploader.is_test_filename("calculator.py")
+
+    @pytest.mark.asyncio
+    async def test_upload_from_archive(self):
+        """Test source files are read from a tar.gz archive"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, content in [
+                ("pkg/calculator.py", b"def add(a, b):\n    return a + b\n"),
+                ("pkg/tests/test_calculator.py", b"def test_add():\n    pass\n"),
+                ("pkg/logo.png", b"\x89PNG"),
+            ]:
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        buffer.seek(0)
+
+        files = await CodeUploader.upload_from_archive(buffer, "project.tar.gz")
+
+        assert [(f.path, f.is_test_file) for f in files] == [
+            ("pkg/calculator.py", False),
+            ("pkg/tests/test_calculator.py", True),
+        ]
+
 
 @pytest.mark.asyncio
 async def test_full_coverage_workflow():
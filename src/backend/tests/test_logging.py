@@ -0,0 +1,44 @@
+import io
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.core import logging as app_logging
+
+
+@pytest.fixture
+def fresh_listener():
+    """Let setup_logging build a new listener, then put the original back"""
+    original = app_logging._log_listener
+    app_logging.stop_log_listener()
+    app_logging._log_listener = None
+    yield
+    app_logging.stop_log_listener()
+    app_logging._log_listener = original
+    app_logging.start_log_listener()
+
+
+def test_record_reaches_stdout_after_setup(fresh_listener, monkeypatch):
+    """Test records are written without the app lifespan running"""
+    # Patched in the test body: pytest re-installs its own capture between setup and call
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stream)
+
+    app_logging.setup_logging()
+    logging.getLogger("test_logging").warning("queued record")
+
+    # Stopping the listener flushes the queue
+    app_logging.stop_log_listener()
+    assert "queued record" in stream.getvalue()
+
+
+def test_full_queue_drops_records():
+    """Test a full queue drops and counts records instead of raising"""
+    handler = app_logging.DroppingQueueHandler(queue.Queue(maxsize=1))
+    for message in ("first", "second", "third"):
+        handler.handle(logging.makeLogRecord({"msg": message, "levelno": logging.INFO}))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
@@ -0,0 +1,46 @@
+import pytest
+from fastapi import HTTPException
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.deps import RateLimiter, _TOKEN_BUCKET_SCRIPT
+
+
+def make_limiter(take_token: AsyncMock) -> RateLimiter:
+    """RateLimiter whose Redis client registers take_token as the Lua script"""
+    fake_redis = MagicMock()
+    fake_redis.register_script.return_value = take_token
+    with patch("redis.asyncio.from_url", return_value=fake_redis):
+        limiter = RateLimiter()
+    fake_redis.register_script.assert_called_once_with(_TOKEN_BUCKET_SCRIPT)
+    return limiter
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    """Test the Redis token bucket rate limiter"""
+
+    async def test_allowed_request_passes(self):
+        """Test a request is let through when the script grants a token"""
+        take_token = AsyncMock(return_value=1)
+        limiter = make_limiter(take_token)
+
+        await limiter.check_limit("user:1", limit=10, window=60)
+
+        take_token.assert_awaited_once_with(keys=["user:1"], args=[10, 10 / 60, 60])
+
+    async def test_denied_request_returns_retry_after(self):
+        """Test an empty bucket raises 429 with the time until the next token"""
+        limiter = make_limiter(AsyncMock(return_value=0))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter.check_limit("user:1", limit=7, window=60)
+
+        assert exc_info.value.status_code == 429
+        # One token refills every 60 / 7 seconds, rounded up
+        assert exc_info.value.headers["Retry-After"] == "9"
+
+    async def test_redis_error_fails_open(self):
+        """Test a Redis failure lets the request through"""
+        limiter = make_limiter(AsyncMock(side_effect=ConnectionError("Redis is down")))
+
+        await limiter.check_limit("user:1", limit=10, window=60)
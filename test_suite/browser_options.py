@@ -0,0 +1,46 @@
+"""
+Shared Chrome options for the generated Selenium tests
+"""
+import os
+import shutil
+
+from selenium.webdriver.chrome.options import Options
+
+# Resolved once at import so each driver session does not repeat the lookup
+CHROME_BIN = next(
+    (
+        path for path in (
+            os.environ.get("CHROME_BIN"),
+            "/snap/bin/chromium",
+            "/usr/bin/chromium",
+            "/usr/bin/google-chrome",
+        )
+        if path and (shutil.which(path) or os.path.exists(path))
+    ),
+    None,
+)
+
+CHROME_ARGUMENTS = [
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-features=TranslateUI,BlinkGenPropertyTrees",
+    "--disable-ipc-flooding-protection",
+    "--mute-audio",
+    "--hide-scrollbars",
+    "--metrics-recording-only",
+    "--dns-prefetch-disable",
+]
+
+
+def build_chrome_options():
+    """Build headless Chrome options tuned for CI throughput"""
+    options = Options()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    return options
@@ -0,0 +1,65 @@
+"""
+Shared pytest hooks for the UI test suite
+"""
+import os
+import shutil
+import socket
+import subprocess
+import time
+import urllib.request
+
+_chromedriver = None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/status", timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def pytest_configure(config):
+    """Start one chromedriver for all pytest-xdist workers to attach to.
+
+    Runs only in the xdist controller, before workers are spawned, so the
+    CHROMEDRIVER_URL it exports is inherited by every worker.
+    """
+    global _chromedriver
+    if hasattr(config, "workerinput") or not getattr(config.option, "numprocesses", None):
+        return
+
+    binary = shutil.which("chromedriver")
+    if binary is None or "CHROMEDRIVER_URL" in os.environ:
+        return
+
+    port = _free_port()
+    _chromedriver = subprocess.Popen(
+        [binary, f"--port={port}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    if _wait_until_ready(url):
+        os.environ["CHROMEDRIVER_URL"] = url
+    else:
+        _chromedriver.terminate()
+        _chromedriver = None
+
+
+def pytest_unconfigure(config):
+    global _chromedriver
+    if _chromedriver is not None:
+        os.environ.pop("CHROMEDRIVER_URL", None)
+        _chromedriver.terminate()
+        _chromedriver.wait(timeout=10)
+        _chromedriver = None
@@ -5,6 +5,7 @@
 import asyncio
 import sys
 import os
+from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src/backend'))
@@ -27,8 +28,7 @@ async def main():
     )
 
     # Сохраняем сгенерированный код
-    with open("debug_generated_test.py", "w") as f:
-        f.write(result["code"])
+    Path("debug_generated_test.py").write_text(result["code"], encoding="utf-8")
 
     print("Сгенерированный код сохранен в debug_generated_test.py")
     print(f"Длина кода: {len(result['code'])}")
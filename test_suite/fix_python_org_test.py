@@ -2,15 +2,14 @@
 """
 Fix the generated python.org test to make it work correctly
 """
-import os
 import re
+from pathlib import Path
 
-# Read the generated test
-with open('generated_python_org_test.py', 'r') as f:
-    content = f.read()
+# Literal fixes as (original, replacement) pairs
+LITERAL_FIXES = {}
 
 # Fix 1: Add Chrome binary location
-content = content.replace(
+LITERAL_FIXES["binary_location"] = (
     '''@pytest.fixture(scope="session")
 def driver():
     options = Options()
@@ -31,7 +30,7 @@ def driver():
 )
 
 # Fix 2: Fix the href comparison issue
-content = content.replace(
+LITERAL_FIXES["href_comparison"] = (
     '''def assert_link_text_and_href(driver, link_text, expected_href):
     link = assert_element_present(driver, By.LINK_TEXT, link_text)
     actual_href = link.get_attribute("href")
@@ -44,7 +43,7 @@ content = content.replace(
 )
 
 # Fix 3: Fix verify_common_site_elements to be more flexible
-content = content.replace(
+LITERAL_FIXES["common_elements"] = (
     '''def verify_common_site_elements(driver):
     # Skip to content link (always present)
     assert_link_text_and_href(driver, "Skip to content", "#content")
@@ -72,20 +71,35 @@ content = content.replace(
 )
 
 # Fix 4: Update home page title check
-content = content.replace(
+LITERAL_FIXES["home_title"] = (
     '''assert driver.title == "Welcome to Python.org"''',
     '''assert "Python" in driver.title'''
 )
 
 # Fix 5: Add better error handling
-content = re.sub(
-    r'element = assert_element_present\(driver, By\.ID, "(.*?)"\)',
-    r'try:\n        element = assert_element_present(driver, By.ID, "\1")\n    except NoSuchElementException:\n        pytest.skip(f"Element \1 not found on page")',
-    content
+ELEMENT_LOOKUP_PATTERN = r'element = assert_element_present\(driver, By\.ID, "(?P<element_id>.*?)"\)'
+ELEMENT_LOOKUP_REPLACEMENT = (
+    'try:\n        element = assert_element_present(driver, By.ID, "{element_id}")\n'
+    '    except NoSuchElementException:\n        pytest.skip(f"Element {element_id} not found on page")'
 )
 
+# All fixes combined into one alternation so the file is rewritten in a single pass
+FIXES_RE = re.compile("|".join(
+    [f"(?P<{name}>{re.escape(original)})" for name, (original, _) in LITERAL_FIXES.items()]
+    + [f"(?P<element_lookup>{ELEMENT_LOOKUP_PATTERN})"]
+))
+
+
+def apply_fix(match):
+    if match.lastgroup == "element_lookup":
+        return ELEMENT_LOOKUP_REPLACEMENT.format(element_id=match.group("element_id"))
+    return LITERAL_FIXES[match.lastgroup][1]
+
+
+content = Path('generated_python_org_test.py').read_text()
+content = FIXES_RE.sub(apply_fix, content)
+
 # Write the fixed test
-with open('generated_python_org_test_fixed.py', 'w') as f:
-    f.write(content)
+Path('generated_python_org_test_fixed.py').write_text(content)
 
 print("Fixed test saved to: generated_python_org_test_fixed.py")
\ No newline at end of file
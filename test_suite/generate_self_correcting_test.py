@@ -2,17 +2,55 @@
 """
 Generate UI test for python.org with self-correction capability
 """
+import argparse
 import asyncio
+import hashlib
 import sys
 import os
 import json
+from dataclasses import dataclass, fields
+from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src/backend'))
 
 from app.services.ai_service import AIService
 from app.services.code_validator import CodeValidator
 
+LLM_CACHE_DIR = Path(".llm_cache")
 
-async def generate_and_correct_test():
+
+@dataclass
+class Summary:
+    """Test totals taken from an Allure results dict"""
+    total_tests: int = 0
+    passed: int = 0
+    failed: int = 0
+    broken: int = 0
+    skipped: int = 0
+
+    @classmethod
+    def from_allure(cls, results):
+        return cls(**{f.name: results.get(f.name, 0) for f in fields(cls)})
+
+
+async def cached_generation(key_parts, generate, use_cache=True):
+    """Return generated code for key_parts, calling the LLM only on a cache miss"""
+    key = hashlib.sha256(json.dumps(key_parts, sort_keys=True).encode()).hexdigest()
+    cache_file = LLM_CACHE_DIR / f"{key}.json"
+
+    if use_cache and cache_file.exists():
+        print(f"✓ Using cached generation ({cache_file})")
+        return json.loads(cache_file.read_text(encoding="utf-8"))
+
+    result = await generate()
+
+    if use_cache and result and "code" in result:
+        LLM_CACHE_DIR.mkdir(exist_ok=True)
+        cache_file.write_text(json.dumps({"code": result["code"]}), encoding="utf-8")
+
+    return result
+
+
+async def generate_and_correct_test(use_cache=True):
     """Generate and iteratively correct a Selenium test for python.org"""
     print("=" * 60)
     print("Generating Self-Correcting Selenium UI Test for python.org")
@@ -25,37 +63,47 @@ async def generate_and_correct_test():
     best_code = None
     best_results = None
     max_attempts = 3
+    # Candidates are generated and executed concurrently within each attempt.
+    # Every execution starts its own Chrome, so cap how many run at once.
+    candidates_per_attempt = 2
+    execution_slots = asyncio.Semaphore(max(1, min(candidates_per_attempt, (os.cpu_count() or 1) // 2)))
 
-    for attempt in range(max_attempts):
-        print(f"\n{'='*60}")
-        print(f"ATTEMPT {attempt + 1} / {max_attempts}")
-        print(f"{'='*60}")
+    async def attempt_once(attempt, candidate):
+        """Generate one candidate test and execute it"""
+        label = f"{attempt + 1}.{candidate + 1}"
 
         if attempt == 0:
             # First attempt - generate fresh test
-            print("\n[Step 1] Generating initial Selenium test...")
-            result = await ai_service.generate_ui_tests(
-                input_method="url",
-                url="https://www.python.org",
-                framework="selenium",
-                custom_prompt="""Generate a comprehensive but robust Selenium test for python.org with:
+            print(f"\n[{label}] Generating initial Selenium test...")
+            url = "https://www.python.org"
+            framework = "selenium"
+            custom_prompt = """Generate a comprehensive but robust Selenium test for python.org with:
 - Focus on tests that actually work in headless mode
 - Test main functionality: navigation, search, page titles
 - Use flexible selectors and assertions
 - Don't test too many pages - focus on core functionality
 - Include proper error handling and waits"""
+            result = await cached_generation(
+                {"url": url, "framework": framework, "custom_prompt": custom_prompt, "candidate": candidate},
+                lambda: ai_service.generate_ui_tests(
+                    input_method="url",
+                    url=url,
+                    framework=framework,
+                    custom_prompt=custom_prompt
+                ),
+                use_cache=use_cache
             )
         else:
             # Subsequent attempts - fix based on previous errors
-            print("\n[Step 1] Fixing test based on previous errors...")
+            print(f"\n[{label}] Fixing test based on previous errors...")
 
             # Prepare error context
             error_context = f"""
 Previous attempt failed with these issues:
-- Total tests: {best_results.get('total_tests', 0)}
-- Passed: {best_results.get('passed', 0)}
-- Failed: {best_results.get('failed', 0)}
-- Broken: {best_results.get('broken', 0)}
+- Total tests: {best_results.total_tests}
+- Passed: {best_results.passed}
+- Failed: {best_results.failed}
+- Broken: {best_results.broken}
 
 Common issues:
 1. Chrome driver initialization failures
@@ -93,63 +141,92 @@ Please return the complete fixed test code. Make sure:
                 }
             ]
 
-            response = await client.complete(
-                messages=messages,
-                max_tokens=4000,
-                temperature=0.2
+            async def fix_code():
+                response = await client.complete(
+                    messages=messages,
+                    max_tokens=4000,
+                    temperature=0.2
+                )
+                return {"code": response.content}
+
+            result = await cached_generation(
+                {"messages": messages, "candidate": candidate},
+                fix_code,
+                use_cache=use_cache
             )
 
-            result = {
-                "code": response.content
-            }
-
         if not result or "code" not in result:
-            print("ERROR: Failed to generate test code")
-            continue
+            print(f"[{label}] ERROR: Failed to generate test code")
+            return None
 
         code = result["code"]
-        print(f"\n✓ Test generated (length: {len(code)} characters)")
+        print(f"\n[{label}] ✓ Test generated (length: {len(code)} characters)")
 
         # Save the generated test
-        output_file = f"generated_test_attempt_{attempt + 1}.py"
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(code)
-        print(f"✓ Test saved to: {output_file}")
+        suffix = "" if candidate == 0 else f"_{candidate + 1}"
+        output_file = f"generated_test_attempt_{attempt + 1}{suffix}.py"
+        Path(output_file).write_text(code, encoding="utf-8")
+        print(f"[{label}] ✓ Test saved to: {output_file}")
 
         # Execute and validate the test
-        print("\n[Step 2] Executing test...")
-        execution = validator.execute_code(
-            code=code,
-            run_with_pytest=True
+        async with execution_slots:
+            print(f"\n[{label}] Executing test...")
+            execution = await asyncio.to_thread(
+                validator.execute_code,
+                code=code,
+                run_with_pytest=True
+            )
+
+        summary = Summary.from_allure(execution.allure_results) if execution.allure_results else None
+        return {"label": label, "code": code, "execution": execution, "summary": summary}
+
+    for attempt in range(max_attempts):
+        print(f"\n{'='*60}")
+        print(f"ATTEMPT {attempt + 1} / {max_attempts}")
+        print(f"{'='*60}")
+
+        candidates = await asyncio.gather(
+            *[attempt_once(attempt, candidate) for candidate in range(candidates_per_attempt)]
         )
+        candidates = [c for c in candidates if c is not None]
+        if not candidates:
+            continue
 
-        print(f"\nExecution Results:")
+        # Keep the candidate with the most passing tests from this attempt
+        candidate = max(
+            candidates,
+            key=lambda c: c["summary"].passed if c["summary"] else 0
+        )
+        code = candidate["code"]
+        execution = candidate["execution"]
+        summary = candidate["summary"]
+
+        print(f"\nExecution Results (best candidate {candidate['label']}):")
         print(f"  - Can execute: {execution.can_execute}")
         print(f"  - Runtime errors: {len(execution.runtime_errors)}")
 
-        if execution.allure_results:
-            results = execution.allure_results
+        if summary:
             print(f"\nTest Results Summary:")
-            print(f"  - Total tests: {results.get('total_tests', 0)}")
-            print(f"  - Passed: {results.get('passed', 0)}")
-            print(f"  - Failed: {results.get('failed', 0)}")
-            print(f"  - Broken: {results.get('broken', 0)}")
-            print(f"  - Skipped: {results.get('skipped', 0)}")
+            print(f"  - Total tests: {summary.total_tests}")
+            print(f"  - Passed: {summary.passed}")
+            print(f"  - Failed: {summary.failed}")
+            print(f"  - Broken: {summary.broken}")
+            print(f"  - Skipped: {summary.skipped}")
 
             # Check if this is the best result so far
-            if best_results is None or results.get('passed', 0) > best_results.get('passed', 0):
+            if best_results is None or summary.passed > best_results.passed:
                 best_code = code
-                best_results = results
+                best_results = summary
                 print("\n✓ This is the best result so far!")
 
                 # If all tests pass, we're done
-                if results.get('passed', 0) == results.get('total_tests', 0):
+                if summary.passed == summary.total_tests:
                     print("\n✅ All tests passed! Test generation complete.")
                     break
             elif best_results is None:
                 # First attempt, even if no Allure results
                 best_code = code
-                best_results = {'total_tests': 0, 'passed': 0, 'failed': 0, 'broken': 0}
+                best_results = Summary()
 
         # If there are runtime errors, show them
         if execution.runtime_errors:
@@ -164,20 +241,19 @@ Please return the complete fixed test code. Make sure:
 
     # Save the best version
     if best_code:
-        with open("best_python_org_test.py", "w", encoding="utf-8") as f:
-            f.write(best_code)
+        Path("best_python_org_test.py").write_text(best_code, encoding="utf-8")
         print(f"\n✓ Best test saved to: best_python_org_test.py")
 
         # Final summary
         print("\n" + "=" * 60)
         print("FINAL RESULTS:")
-        print(f"  - Total tests: {best_results.get('total_tests', 0)}")
-        print(f"  - Passed: {best_results.get('passed', 0)}")
-        print(f"  - Failed: {best_results.get('failed', 0)}")
-        print(f"  - Broken: {best_results.get('broken', 0)}")
+        print(f"  - Total tests: {best_results.total_tests}")
+        print(f"  - Passed: {best_results.passed}")
+        print(f"  - Failed: {best_results.failed}")
+        print(f"  - Broken: {best_results.broken}")
         print("=" * 60)
 
-        return best_results.get('passed', 0) > 0
+        return best_results.passed > 0
     else:
         print("\n✗ No successful test generated")
         return False
@@ -185,7 +261,11 @@ Please return the complete fixed test code. Make sure:
 
 async def main():
     """Main function"""
-    success = await generate_and_correct_test()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-cache", action="store_true", help="Always call the LLM, bypassing .llm_cache")
+    args = parser.parse_args()
+
+    success = await generate_and_correct_test(use_cache=not args.no_cache)
 
     if success:
         print("\n" + "=" * 60)
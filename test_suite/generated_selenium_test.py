@@ -2,27 +2,32 @@ import pytest
 import allure
 from allure_commons.types import Severity
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from browser_options import build_chrome_options
+
 BASE_URL = "https://example.com"
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def driver():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    driver = webdriver.Chrome(options=options)
-    driver.implicitly_wait(10)
+    options = build_chrome_options()
+    # Return from driver.get() at DOMContentLoaded; no test inspects late subresources
+    options.page_load_strategy = "eager"
+    # Reuse one HTTP connection to chromedriver for every WebDriver command
+    driver = webdriver.Chrome(options=options, keep_alive=True)
     yield driver
     driver.quit()
 
 
+@pytest.fixture(autouse=True)
+def clean_session(driver):
+    yield
+    driver.delete_all_cookies()
+
+
 @allure.feature("UI Testing")
 @allure.story("User Workflows")
 @allure.tag("ui", "e2e", "generated_by_ai")
@@ -1,3 +1,11 @@
+import functools
+import os
+import re
+import threading
+import urllib.request
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
 import pytest
 import allure
 from allure_commons.types import Severity
@@ -9,9 +17,23 @@ from selenium.webdriver.support import expected_conditions as EC
 
 BASE_URL = "https://www.python.org"
 
+# Set UI_TEST_REPLAY_CACHE to a directory to snapshot the BASE_URL page there
+# once and serve it locally, instead of fetching python.org on every navigation
+REPLAY_CACHE_DIR = os.environ.get("UI_TEST_REPLAY_CACHE")
+
+MAIN_NAVIGATION_LINKS = [
+    ("Python", "/"),
+    ("PSF", "https://www.python.org/psf/"),
+    ("Docs", "https://docs.python.org"),
+    ("PyPI", None),
+    ("Jobs", None),
+    ("Community", None),
+    ("Donate", None),
+]
+
 
 @pytest.fixture(scope="session")
-def driver():
+def driver(tmp_path_factory):
     options = Options()
     # Chrome binary location for headless Linux environments
     options.binary_location = "/snap/bin/chromium"
@@ -20,41 +42,95 @@ def driver():
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
-    options.add_argument("--remote-debugging-port=9222")
+    # Each xdist worker gets its own session, so keep Chrome profiles apart and
+    # let Chrome pick a free debugging port instead of a shared fixed one
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    options.add_argument(f"--user-data-dir={tmp_path_factory.mktemp(f'chrome-{worker}')}")
+    options.add_argument("--remote-debugging-port=0")
     # Additional stability options
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-plugins")
-    options.add_argument("--disable-images")  # Disable images for faster loading
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--single-process")  # May help with memory issues
+    # Block image loading through the content-settings pref rather than a command-line flag
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
     # Initialize WebDriver
-    driver = webdriver.Chrome(options=options)
+    # Return from driver.get() at DOMContentLoaded instead of the full load event
+    options.page_load_strategy = "eager"
+    # Under pytest-xdist, attach to the chromedriver started once in conftest.py
+    chromedriver_url = os.environ.get("CHROMEDRIVER_URL")
+    if chromedriver_url:
+        driver = webdriver.Remote(command_executor=chromedriver_url, options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
     driver.set_page_load_timeout(60)  # Increased to 60 seconds
-    driver.implicitly_wait(20)  # Increased implicit wait to 20 seconds
+    # No implicit wait: it compounds with explicit waits and stalls negative lookups
+    driver.implicitly_wait(0)
     yield driver
     driver.quit()
 
 
+def wait(driver, timeout=10):
+    """Explicit wait that polls every 100ms instead of the default 500ms"""
+    return WebDriverWait(driver, timeout, poll_frequency=0.1)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def home_url():
+    """URL the tests treat as the home page: live BASE_URL or a local replay"""
+    if not REPLAY_CACHE_DIR:
+        yield BASE_URL
+        return
+
+    cache_dir = Path(REPLAY_CACHE_DIR)
+    snapshot = cache_dir / "index.html"
+    if not snapshot.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(BASE_URL, timeout=30) as response:
+            html = response.read().decode("utf-8")
+        # Resolve links, forms and stylesheets against the live site so hrefs
+        # and the search form behave exactly as on python.org
+        html = re.sub(r"<head[^>]*>", lambda m: f'{m.group(0)}<base href="{BASE_URL}/">', html, count=1)
+        snapshot.write_text(html, encoding="utf-8")
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(_QuietHandler, directory=str(cache_dir)),
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def home(driver, home_url):
+    """Make sure the browser is on the home page, navigating only when it is not"""
+    if driver.current_url.split("#")[0].rstrip("/") != home_url:
+        with allure.step(f"Navigate to {home_url}"):
+            driver.get(home_url)
+    return driver
+
+
 @allure.feature("UI Testing")
 @allure.story("User Workflows")
 @allure.tag("ui", "e2e", "generated_by_ai")
+@pytest.mark.usefixtures("home")
 class TestUI:
 
     @allure.title("Verify page title contains welcome message")
     @allure.severity(allure.severity_level.NORMAL)
     def test_page_title(self, driver):
-        with allure.step(f"Navigate to {BASE_URL}"):
-            driver.get(BASE_URL)
         with allure.step("Verify page title contains expected text"):
             assert "Welcome to Python.org" in driver.title
 
     @allure.title("Verify 'Skip to content' link is present and correct")
     @allure.severity(allure.severity_level.NORMAL)
     def test_skip_to_content_link(self, driver):
-        with allure.step(f"Navigate to {BASE_URL}"):
-            driver.get(BASE_URL)
         with allure.step("Locate 'Skip to content' link"):
-            skip_link = WebDriverWait(driver, 20).until(
+            skip_link = wait(driver, 20).until(
                 EC.presence_of_element_located((By.LINK_TEXT, "Skip to content"))
             )
         with allure.step("Verify the link is displayed"):
@@ -65,40 +141,37 @@ class TestUI:
 
     @allure.title("Validate main navigation links hrefs")
     @allure.severity(allure.severity_level.NORMAL)
-    @pytest.mark.parametrize(
-        "link_text,expected_href",
-        [
-            ("Python", "/"),
-            ("PSF", "https://www.python.org/psf/"),
-            ("Docs", "https://docs.python.org"),
-            ("PyPI", None),
-            ("Jobs", None),
-            ("Community", None),
-            ("Donate", None),
-        ],
-    )
-    def test_main_navigation_links(self, driver, link_text, expected_href):
-        with allure.step(f"Navigate to {BASE_URL}"):
-            driver.get(BASE_URL)
-        with allure.step(f"Locate navigation link with text '{link_text}'"):
-            link = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.LINK_TEXT, link_text))
+    def test_main_navigation_links(self, driver):
+        with allure.step("Collect navigation links from the page"):
+            wait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "nav")))
+            # One round-trip for all links: the first anchor per link text, as By.LINK_TEXT would match
+            links = driver.execute_script(
+                """
+                var links = {};
+                document.querySelectorAll("a").forEach(function (a) {
+                    var text = a.innerText.trim();
+                    if (text && !(text in links)) {
+                        var rect = a.getBoundingClientRect();
+                        links[text] = {href: a.href, displayed: rect.width > 0 && rect.height > 0};
+                    }
+                });
+                return links;
+                """
             )
-        with allure.step("Verify the link is displayed"):
-            assert link.is_displayed()
-        if expected_href:
-            with allure.step(f"Verify link href ends with expected fragment '{expected_href}'"):
-                href = link.get_attribute("href")
-                assert href.endswith(expected_href)
+        for link_text, expected_href in MAIN_NAVIGATION_LINKS:
+            with allure.step(f"Verify navigation link '{link_text}' is displayed"):
+                assert link_text in links, f"Navigation link '{link_text}' not found"
+                assert links[link_text]["displayed"]
+            if expected_href:
+                with allure.step(f"Verify link href ends with expected fragment '{expected_href}'"):
+                    assert links[link_text]["href"].endswith(expected_href)
 
     @allure.title("Search functionality returns results for query")
     @allure.severity(allure.severity_level.CRITICAL)
     def test_search_functionality(self, driver):
         query = "list comprehension"
-        with allure.step(f"Navigate to {BASE_URL}"):
-            driver.get(BASE_URL)
         with allure.step("Locate the search input field"):
-            search_input = WebDriverWait(driver, 10).until(
+            search_input = wait(driver, 10).until(
                 EC.element_to_be_clickable((By.NAME, "q"))
             )
         with allure.step(f"Enter text '{query}' into search field"):
@@ -107,7 +180,7 @@ class TestUI:
         with allure.step("Submit the search form"):
             search_input.submit()
         with allure.step("Wait for results page title to contain 'Search'"):
-            WebDriverWait(driver, 10).until(EC.title_contains("Search"))
+            wait(driver, 10).until(EC.title_contains("Search"))
         with allure.step("Verify the page title contains 'Search'"):
             assert "Search" in driver.title
         with allure.step("Verify the query appears in the page body"):
@@ -118,16 +191,14 @@ class TestUI:
     @allure.severity(allure.severity_level.NORMAL)
     def test_paragraph_excerpt(self, driver):
         excerpt_snippet = "The core of extensible programming is defining functions"
-        with allure.step(f"Navigate to {BASE_URL}"):
-            driver.get(BASE_URL)
         with allure.step("Locate paragraph containing the expected snippet (case‑insensitive)"):
-            paragraph = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located(
-                    (
-                        By.XPATH,
-                        f"//p[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-                        f"'{excerpt_snippet.lower()}')]",
-                    )
+            # Native string matching in JS instead of an XPath translate() over every <p>
+            paragraph = wait(driver, 10).until(
+                lambda d: d.execute_script(
+                    "var snippet = arguments[0];"
+                    " return Array.from(document.querySelectorAll('p'))"
+                    ".find(function (p) { return p.textContent.toLowerCase().includes(snippet); }) || null;",
+                    excerpt_snippet.lower(),
                 )
             )
         with allure.step("Verify the paragraph is displayed"):
@@ -2,35 +2,12 @@
 """
 Patch the AI service to support custom prompts and better test generation
 """
-import os
+import ast
+from pathlib import Path
 
-# Read the original ai_service.py
-with open('src/backend/app/services/ai_service.py', 'r') as f:
-    content = f.read()
+AI_SERVICE_PATH = Path('src/backend/app/services/ai_service.py')
 
-# Find the generate_ui_tests method and modify it
-import re
-
-# Pattern to find the method signature
-method_pattern = r'(async def generate_ui_tests\(\s*self,\s*input_method: str,\s*html_content: Optional\[str\] = None,\s*url: Optional\[str\] = None,\s*selectors: Optional\[Dict\[str, str\]\] = None,\s*framework: str = "playwright")\s*-> Dict\[str, Any\]:'
-
-# Add custom_prompt parameter
-new_method_signature = r'\1,\n        custom_prompt: Optional[str] = None\n    ) -> Dict[str, Any]:'
-
-content = re.sub(method_pattern, new_method_signature, content)
-
-# Save the modified file
-with open('src/backend/app/services/ai_service.py', 'w') as f:
-    f.write(content)
-
-print("✓ Updated AIService to support custom_prompt parameter")
-
-# Now let's also update the system prompt generation to include Chrome-specific configurations
-system_prompt_fix = '''
-# Find where the stage1_system is defined and enhance it
-content = content.replace(
-    'stage1_system = f"""You are an expert in UI/E2E testing with {framework}.',
-    '''stage1_system = f"""You are an expert in UI/E2E testing with {framework}.
+STAGE1_SYSTEM = '''f"""You are an expert in UI/E2E testing with {framework}.
 
 IMPORTANT FOR SELENIUM TESTS:
 When generating Selenium tests for headless Linux environments:
@@ -47,16 +24,87 @@ When generating Selenium tests for headless Linux environments:
 6. Focus on robust, working tests
 
 Generate clean, functional UI tests WITHOUT Allure decorators (for Python) or reporting tools.
-Focus on test logic, element interactions, and {framework} best practices."""
+Focus on test logic, element interactions, and {framework} best practices."""'''
+
+CUSTOM_PROMPT_BLOCK = '''
+
+        # Add custom prompt if provided
+        if custom_prompt:
+            stage1_system += f"\\n\\nADDITIONAL REQUIREMENTS:\\n{custom_prompt}"'''
+
+
+def find_generate_ui_tests(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AsyncFunctionDef) and node.name == "generate_ui_tests":
+            return node
+    raise SystemExit("generate_ui_tests not found in ai_service.py")
+
+
+def plan_edits(source, method):
+    """Return (start, end, text) byte-offset edits for the generate_ui_tests method"""
+    encoded = source.encode()
+    line_starts = [0]
+    for line in encoded.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    def offset(lineno, col):
+        return line_starts[lineno - 1] + col
+
+    edits = []
+
+    # Add the custom_prompt parameter after the last existing one
+    if "custom_prompt" not in [arg.arg for arg in method.args.args]:
+        last = method.args.defaults[-1] if method.args.defaults else method.args.args[-1]
+        end = offset(last.end_lineno, last.end_col_offset)
+        edits.append((end, end, ",\n        custom_prompt: Optional[str] = None"))
+
+    # One walk over the method finds both the prompt assignment and any read of custom_prompt
+    stage1 = None
+    uses_custom_prompt = False
+    for node in ast.walk(method):
+        if stage1 is None and isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "stage1_system" for t in node.targets
+        ):
+            stage1 = node
+        elif isinstance(node, ast.Name) and node.id == "custom_prompt" and isinstance(node.ctx, ast.Load):
+            uses_custom_prompt = True
+    if stage1 is None:
+        raise SystemExit("stage1_system assignment not found in generate_ui_tests")
+
+    # Replace the stage 1 system prompt unless it already carries the Selenium guidance
+    if "IMPORTANT FOR SELENIUM TESTS" not in ast.get_source_segment(source, stage1.value):
+        edits.append((
+            offset(stage1.value.lineno, stage1.value.col_offset),
+            offset(stage1.value.end_lineno, stage1.value.end_col_offset),
+            STAGE1_SYSTEM,
+        ))
+
+    # Append the custom prompt to the system prompt unless the method already reads it
+    if not uses_custom_prompt:
+        end = offset(stage1.end_lineno, stage1.end_col_offset)
+        edits.append((end, end, CUSTOM_PROMPT_BLOCK))
+
+    return edits
+
+
+def main():
+    source = AI_SERVICE_PATH.read_text()
+    edits = plan_edits(source, find_generate_ui_tests(ast.parse(source)))
+
+    if not edits:
+        print("✓ AIService already supports custom_prompt, nothing to do")
+        return
+
+    # Apply from the end so earlier offsets stay valid, then write once
+    patched = source.encode()
+    for start, end, text in sorted(edits, reverse=True):
+        patched = patched[:start] + text.encode() + patched[end:]
+    AI_SERVICE_PATH.write_bytes(patched)
 
-    # Add custom prompt if provided
-    if custom_prompt:
-        stage1_system += f"\\n\\nADDITIONAL REQUIREMENTS:\\n{custom_prompt}"'''
-)
+    print("✓ Updated AIService to support custom_prompt parameter")
+    print("✓ Updated system prompt generation")
+    print("\nTo apply these changes, please restart your application.")
 
-# Apply the system prompt fix
-with open('src/backend/app/services/ai_service.py', 'w') as f:
-    f.write(eval(f'f"""{content}"""'))
 
-print("✓ Updated system prompt generation")
-print("\nTo apply these changes, please restart your application.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
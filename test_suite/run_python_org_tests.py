@@ -18,6 +18,7 @@ def run_tests():
     cmd = [
         'python', '-m', 'pytest',
         'generated_test_attempt_1.py',
+        '-n', 'auto',  # One Chrome per pytest-xdist worker
         '-v',
         '--tb=short',
         '--timeout=300',  # 5 minutes timeout per test
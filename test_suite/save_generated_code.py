@@ -5,6 +5,7 @@
 import asyncio
 import sys
 import os
+from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src/backend'))
 
@@ -24,15 +25,18 @@ async def save_generated_code():
     
     code = result['code']
     
-    # Сохранение в файл
-    with open('generated_selenium_test.py', 'w') as f:
-        f.write(code)
+    # Сохранение в файл в отдельном потоке, чтобы не блокировать event loop
+    write_task = asyncio.create_task(
+        asyncio.to_thread(Path('generated_selenium_test.py').write_text, code)
+    )
     
-    print(f"✓ Код сохранен в generated_selenium_test.py ({len(code)} символов)")
     print("\nПервые 1000 символов:")
     print("=" * 80)
     print(code[:1000])
     print("=" * 80)
+    
+    await write_task
+    print(f"✓ Код сохранен в generated_selenium_test.py ({len(code)} символов)")
 
 
 if __name__ == "__main__":